@@ -4,11 +4,52 @@ Handler for command execution questions.
 
 import os
 import re
-import subprocess
+import asyncio
+import hashlib
+import shlex
 import tempfile
 import shutil
 from typing import Optional, Tuple, List
 
+# Precompiled patterns for locating commands in a question
+_CMD_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'run\s+([\w\s\-@\.|\d]+)\.\s+What',
+    r'execute\s+([\w\s\-@\.|\d]+)\.\s+What',
+    r'command[:\s]+([\w\s\-@\.|\d]+)\.\s+What'
+))
+
+# Prettier is installed once into a persistent cache instead of resolved by npx per call
+PRETTIER_VERSION = "3.4.2"
+_PRETTIER_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "tds-proj-2", "prettier")
+_PRETTIER_BIN = os.path.join(_PRETTIER_CACHE_DIR, "node_modules", ".bin", "prettier")
+_PRETTIER_SENTINEL = os.path.join(_PRETTIER_CACHE_DIR, f".installed-{PRETTIER_VERSION}")
+_PRETTIER_NPX_PREFIX = f"npx -y prettier@{PRETTIER_VERSION}"
+
+# Options that make npx run a package other than the one named after -y
+_NPX_PACKAGE_OPTIONS = frozenset({"--package", "-p", "--call", "-c"})
+
+# Options allowed after the leading arguments; anything else is rejected
+_PRETTIER_FLAGS = frozenset({"--check", "--list-different", "--write", "--no-semi", "--single-quote", "--use-tabs"})
+_SHA256SUM_FLAGS = frozenset({"--binary", "--text", "--tag", "-b", "-t"})
+
+# Stage working files on tmpfs when available
+_WORK_ROOT = "/dev/shm" if os.access("/dev/shm", os.W_OK) else None
+
+
+def _stage_file(src: str, dst: str) -> None:
+    """
+    Copy a file into a working directory.
+
+    The working directory is usually on tmpfs, a different filesystem from
+    the uploads, so the file is copied rather than hardlinked; copyfile uses
+    sendfile on Linux, so the data never passes through user space.
+
+    Args:
+        src: Path to the source file
+        dst: Destination path
+    """
+    shutil.copyfile(src, dst)
+
 
 class CommandHandler:
     """Handler for questions involving command execution."""
@@ -16,15 +57,22 @@ class CommandHandler:
     # Define allowed commands for security
     ALLOWED_COMMANDS = {
         "npx": {
-            "allowed_args": ["-y", "prettier@3.4.2"],
-            "allowed_files": [".md", ".js", ".json", ".html", ".css"]
+            "required_args": ("-y", f"prettier@{PRETTIER_VERSION}"),
+            "allowed_args": _PRETTIER_FLAGS,
+            "allowed_files": (".md", ".js", ".json", ".html", ".css")
         },
         "sha256sum": {
-            "allowed_args": [],
-            "allowed_files": ["*"]  # Allow any file for sha256sum
+            "required_args": (),
+            "allowed_args": _SHA256SUM_FLAGS,
+            "allowed_files": ("*",)  # Allow any file for sha256sum
         }
     }
 
+    # Shared prettier install state
+    _prettier_lock = asyncio.Lock()
+    _prettier_bin: Optional[str] = None
+    _prettier_failed = False
+
     async def process_command_question(self, question: str, file_path: Optional[str]) -> str:
         """
         Process a question requiring command execution.
@@ -44,12 +92,19 @@ class CommandHandler:
         if not commands:
             return "Error: Could not identify command to execute from question."
 
+        # Dispatch the common `npx -y prettier@x.y.z <file> | sha256sum` pipeline
+        # straight to the fused prettier + in-process hash path
+        canonical = self._canonicalize(commands)
+        if (len(canonical) == 2 and canonical[1] == "sha256sum"
+                and canonical[0].rsplit(" ", 1)[0] == _PRETTIER_NPX_PREFIX):
+            return await self.test_npx_prettier(file_path)
+
         # Create a temporary working directory
-        with tempfile.TemporaryDirectory() as temp_dir:
+        with tempfile.TemporaryDirectory(prefix="tds-", dir=_WORK_ROOT) as temp_dir:
             # Copy the uploaded file to the temp directory
             file_name = os.path.basename(file_path)
             temp_file_path = os.path.join(temp_dir, file_name)
-            shutil.copy(file_path, temp_file_path)
+            await asyncio.to_thread(_stage_file, file_path, temp_file_path)
 
             # Execute the commands
             result = await self._execute_commands(commands, temp_dir, file_name)
@@ -66,14 +121,8 @@ class CommandHandler:
             List of command strings
         """
         # Look for common command patterns
-        command_patterns = [
-            r'run\s+([\w\s\-@\.|\d]+)\.\s+What',
-            r'execute\s+([\w\s\-@\.|\d]+)\.\s+What',
-            r'command[:\s]+([\w\s\-@\.|\d]+)\.\s+What'
-        ]
-
-        for pattern in command_patterns:
-            match = re.search(pattern, question, re.IGNORECASE)
+        for pattern in _CMD_PATTERNS:
+            match = pattern.search(question)
             if match:
                 command_text = match.group(1).strip()
 
@@ -85,6 +134,18 @@ class CommandHandler:
 
         return []
 
+    def _canonicalize(self, commands: List[str]) -> List[str]:
+        """
+        Normalize commands for pattern matching.
+
+        Args:
+            commands: List of command strings
+
+        Returns:
+            Lowercased commands with whitespace collapsed
+        """
+        return [" ".join(cmd.lower().split()) for cmd in commands]
+
     async def _execute_commands(self, commands: List[str], working_dir: str, file_name: str) -> str:
         """
         Execute a list of commands in sequence, piping output between them.
@@ -101,8 +162,8 @@ class CommandHandler:
             result = None
 
             for cmd_str in commands:
-                # Parse the command
-                cmd_parts = cmd_str.split()
+                # Parse the command, honouring quoted arguments
+                cmd_parts = shlex.split(cmd_str)
                 command = cmd_parts[0]
 
                 # Replace file placeholder if present
@@ -115,55 +176,139 @@ class CommandHandler:
                     return f"Error: Command '{command}' is not allowed for security reasons."
 
                 # Build the final command based on the allowed list
-                allowed_config = self.ALLOWED_COMMANDS[command]
-                final_cmd = [command]
-
-                # Add allowed arguments
-                for arg in cmd_parts[1:]:
-                    if arg == file_name:
-                        final_cmd.append(arg)
-                    elif arg in allowed_config["allowed_args"] or arg.startswith("--"):
-                        final_cmd.append(arg)
-                    elif command == "npx" and "@" in arg:  # Special case for npx packages
-                        if any(allowed_pkg in arg for allowed_pkg in allowed_config["allowed_args"]):
-                            final_cmd.append(arg)
-                        else:
-                            return f"Error: Package '{arg}' is not allowed for security reasons."
-
-                # Execute the command
-                if result is None:
-                    # First command in the pipe
-                    process = subprocess.run(
-                        final_cmd,
-                        cwd=working_dir,
-                        capture_output=True,
-                        text=True
-                    )
-                    result = process.stdout
+                error = self._check_arguments(command, cmd_parts[1:], file_name)
+                if error:
+                    return error
+                final_cmd = cmd_parts
 
-                    # Check for errors
-                    if process.returncode != 0:
-                        return f"Error executing {command}: {process.stderr}"
-                else:
-                    # Pipe previous result to this command
-                    process = subprocess.run(
-                        final_cmd,
-                        cwd=working_dir,
-                        input=result,
-                        capture_output=True,
-                        text=True
-                    )
-                    result = process.stdout
+                # Hash piped input in-process; output matches GNU sha256sum on stdin
+                if command == "sha256sum" and len(final_cmd) == 1 and result is not None:
+                    result = self._sha256sum_stdin(result).encode('utf-8') + b"\n"
+                    continue
 
-                    # Check for errors
-                    if process.returncode != 0:
-                        return f"Error executing {command}: {process.stderr}"
+                # Execute the command, piping the previous result if any
+                returncode, stdout, stderr = await self._run_process(final_cmd, working_dir, result)
+                result = stdout
 
-            return result.strip()
+                # Check for errors
+                if returncode != 0:
+                    return f"Error executing {command}: {stderr.decode('utf-8', errors='replace')}"
+
+            return result.decode('utf-8', errors='replace').strip()
 
         except Exception as e:
             return f"Error executing commands: {str(e)}"
 
+    def _check_arguments(self, command: str, args: List[str], file_name: str) -> Optional[str]:
+        """
+        Validate a command's arguments by position against its allowlist.
+
+        The required leading arguments must appear first and in order (for
+        npx, "-y" then the pinned prettier package). Each later argument must be
+        the uploaded file's name or one of the command's allowed flags.
+
+        Args:
+            command: Name of an allowed command
+            args: Arguments following the command name
+            file_name: Name of the file to operate on
+
+        Returns:
+            An error message, or None if every argument is allowed
+        """
+        allowed_config = self.ALLOWED_COMMANDS[command]
+        required = allowed_config["required_args"]
+
+        for position, arg in enumerate(args):
+            option = arg.split("=", 1)[0]
+            if command == "npx" and option in _NPX_PACKAGE_OPTIONS:
+                return f"Error: Option '{arg}' is not allowed for security reasons."
+
+            if position < len(required):
+                if arg == required[position]:
+                    continue
+                if "@" in arg:
+                    return f"Error: Package '{arg}' is not allowed for security reasons."
+                return f"Error: Expected '{required[position]}' at argument {position + 1}, got '{arg}'."
+
+            if arg == file_name:
+                allowed_files = allowed_config["allowed_files"]
+                if "*" not in allowed_files and not file_name.lower().endswith(allowed_files):
+                    return f"Error: File type of '{arg}' is not allowed for {command}."
+            elif arg not in allowed_config["allowed_args"]:
+                return f"Error: Argument '{arg}' is not allowed for security reasons."
+
+        if len(args) < len(required):
+            return f"Error: {command} requires the arguments: {' '.join(required)}"
+
+        return None
+
+    async def _run_process(self, cmd: List[str], cwd: str,
+                           input_data: Optional[bytes] = None) -> Tuple[int, bytes, bytes]:
+        """
+        Run a command without blocking the event loop.
+
+        Args:
+            cmd: Command and its arguments
+            cwd: Directory to execute the command in
+            input_data: Optional bytes to send to the command's stdin
+
+        Returns:
+            Tuple of (return code, stdout bytes, stderr bytes)
+        """
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            cwd=cwd,
+            stdin=asyncio.subprocess.PIPE if input_data is not None else None,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        stdout, stderr = await process.communicate(input_data)
+        return process.returncode, stdout, stderr
+
+    def _sha256sum_stdin(self, data: bytes) -> str:
+        """
+        Hash bytes in-process, formatted like `sha256sum` reading from stdin.
+
+        Args:
+            data: Bytes that would have been piped to sha256sum
+
+        Returns:
+            The digest followed by two spaces and "-"
+        """
+        return f"{hashlib.sha256(data).hexdigest()}  -"
+
+    async def _ensure_prettier(self) -> Optional[str]:
+        """
+        Install prettier into the persistent cache directory once.
+
+        Returns:
+            Path to the prettier binary, or None if it could not be installed
+        """
+        if CommandHandler._prettier_bin or CommandHandler._prettier_failed:
+            return CommandHandler._prettier_bin
+
+        async with CommandHandler._prettier_lock:
+            if CommandHandler._prettier_bin or CommandHandler._prettier_failed:
+                return CommandHandler._prettier_bin
+
+            try:
+                if not os.path.exists(_PRETTIER_SENTINEL):
+                    os.makedirs(_PRETTIER_CACHE_DIR, exist_ok=True)
+                    returncode, _, _ = await self._run_process(
+                        ["npm", "install", "--prefix", _PRETTIER_CACHE_DIR, f"prettier@{PRETTIER_VERSION}"],
+                        _PRETTIER_CACHE_DIR
+                    )
+                    if returncode != 0 or not os.path.exists(_PRETTIER_BIN):
+                        CommandHandler._prettier_failed = True
+                        return None
+                    open(_PRETTIER_SENTINEL, "w").close()
+
+                CommandHandler._prettier_bin = _PRETTIER_BIN
+            except OSError:
+                CommandHandler._prettier_failed = True
+
+        return CommandHandler._prettier_bin
+
     async def test_npx_prettier(self, file_path: str) -> str:
         """
         Run npx prettier and sha256sum on a file.
@@ -176,36 +321,26 @@ class CommandHandler:
         """
         # Special handler for the npx prettier | sha256sum case
         try:
-            with tempfile.TemporaryDirectory() as temp_dir:
+            with tempfile.TemporaryDirectory(prefix="tds-", dir=_WORK_ROOT) as temp_dir:
                 # Copy the uploaded file
                 file_name = os.path.basename(file_path)
                 temp_file_path = os.path.join(temp_dir, file_name)
-                shutil.copy(file_path, temp_file_path)
-
-                # Run npx prettier
-                prettier_process = subprocess.run(
-                    ["npx", "-y", "prettier@3.4.2", file_name],
-                    cwd=temp_dir,
-                    capture_output=True,
-                    text=True
-                )
-
-                if prettier_process.returncode != 0:
-                    return f"Error running prettier: {prettier_process.stderr}"
-
-                # Pipe output to sha256sum
-                sha_process = subprocess.run(
-                    ["sha256sum"],
-                    cwd=temp_dir,
-                    input=prettier_process.stdout,
-                    capture_output=True,
-                    text=True
-                )
-
-                if sha_process.returncode != 0:
-                    return f"Error running sha256sum: {sha_process.stderr}"
-
-                return sha_process.stdout.strip()
+                await asyncio.to_thread(_stage_file, file_path, temp_file_path)
+
+                # Run the cached prettier, falling back to npx if it could not be installed
+                prettier_bin = await self._ensure_prettier()
+                if prettier_bin:
+                    prettier_cmd = [prettier_bin, file_name]
+                else:
+                    prettier_cmd = ["npx", "-y", f"prettier@{PRETTIER_VERSION}", file_name]
+
+                returncode, prettier_output, stderr = await self._run_process(prettier_cmd, temp_dir)
+
+                if returncode != 0:
+                    return f"Error running prettier: {stderr.decode('utf-8', errors='replace')}"
+
+                # Hash prettier's output the same way `| sha256sum` would
+                return self._sha256sum_stdin(prettier_output)
 
         except Exception as e:
             return f"Error running npx prettier | sha256sum: {str(e)}"
\ No newline at end of file
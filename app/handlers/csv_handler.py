@@ -2,12 +2,17 @@
 Handler for CSV extraction questions.
 """
 
-import os
 import zipfile
-import tempfile
-import pandas as pd
 import re
-from typing import Optional
+import pyarrow as pa
+import pyarrow.csv as pacsv
+from typing import IO, Optional, Union
+
+# Matches a quoted column name in a question
+_COL_RE = re.compile(r'\"(\w+)\"')
+
+# Small read blocks so only the start of the file is parsed to reach the first row
+_CSV_BLOCK_SIZE = 1 << 16
 
 
 class CSVHandler:
@@ -26,7 +31,7 @@ class CSVHandler:
         """
         # Check if we need to extract a specific column
         column = "answer"  # Default column
-        column_match = re.search(r'\"(\w+)\"', question)
+        column_match = _COL_RE.search(question)
         if column_match:
             column = column_match.group(1)
         
@@ -50,18 +55,15 @@ class CSVHandler:
             The extracted value or error message
         """
         try:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                    zip_ref.extractall(temp_dir)
-                
-                # Find CSV files in the extracted contents
-                for root, _, files in os.walk(temp_dir):
-                    for file in files:
-                        if file.lower().endswith('.csv'):
-                            csv_path = os.path.join(root, file)
-                            return await self.extract_from_csv(csv_path, column)
-                
-                return "No CSV file found in the ZIP archive."
+            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+                # Find CSV files without extracting the archive to disk
+                csv_names = [name for name in zip_ref.namelist() if name.lower().endswith('.csv')]
+                if not csv_names:
+                    return "No CSV file found in the ZIP archive."
+
+                # Read the member directly; ZIP members are file-like
+                with zip_ref.open(csv_names[0]) as csv_file:
+                    return await self._read_csv_handle(csv_file, column)
         
         except Exception as e:
             return f"Error extracting from ZIP: {str(e)}"
@@ -77,36 +79,82 @@ class CSVHandler:
         Returns:
             The extracted value or error message
         """
+        return await self._read_csv_handle(csv_path, column)
+
+    async def _read_csv_handle(self, source: Union[str, IO[bytes]], column: str) -> str:
+        """
+        Extract the first value of a column from a CSV path or binary file handle.
+
+        Args:
+            source: Path to the CSV file or a seekable binary handle
+            column: Name of the column to extract
+
+        Returns:
+            The extracted value or error message
+        """
+        def open_reader(encoding: str, convert_options: Optional[pacsv.ConvertOptions] = None) -> pacsv.CSVStreamingReader:
+            # Rewind handles so each read starts at the top
+            if hasattr(source, 'seek'):
+                source.seek(0)
+            read_options = pacsv.ReadOptions(block_size=_CSV_BLOCK_SIZE, encoding=encoding)
+            return pacsv.open_csv(source, read_options=read_options, convert_options=convert_options)
+
         try:
-            # Try different encodings to handle potential encoding issues
+            # Try different encodings; only the first block is decoded here
             encodings = ['utf-8', 'latin1', 'cp1252']
-            df = None
+            reader = None
+            encoding = None
 
-            for encoding in encodings:
+            for candidate_encoding in encodings:
                 try:
-                    df = pd.read_csv(csv_path, encoding=encoding)
-                    break
-                except UnicodeDecodeError:
+                    candidate = open_reader(candidate_encoding)
+                except pa.ArrowInvalid:
+                    continue
+                # Arrow infers undecodable text columns as binary rather than failing
+                if any(pa.types.is_binary(field.type) for field in candidate.schema):
                     continue
+                reader = candidate
+                encoding = candidate_encoding
+                break
+
+            if reader is None:
+                return "Error reading CSV file: unable to decode file"
+
+            # Resolve the column name, falling back to case-insensitive matching
+            column_names = reader.schema.names
+            resolved = None
+            if column in column_names:
+                resolved = column
+            else:
+                column_lower = column.lower()
+                for col in column_names:
+                    if col.lower() == column_lower:
+                        resolved = col
+                        break
 
-            if df is None:
-                # Last resort: read with error handling
-                df = pd.read_csv(csv_path, encoding='utf-8', errors='replace')
+            if resolved is None:
+                # If column doesn't exist, list available columns
+                columns = ", ".join(column_names)
+                return f"Column '{column}' not found. Available columns: {columns}"
 
-            # Check if the requested column exists
-            if column in df.columns:
-                # Return the first value in the column
-                return str(df[column].iloc[0])
+            # Re-read only the requested column as text, so the cell comes back
+            # exactly as written instead of as an inferred timestamp or number;
+            # only a truly empty cell becomes null
+            reader = open_reader(encoding, pacsv.ConvertOptions(
+                column_types={resolved: pa.string()},
+                include_columns=[resolved],
+                null_values=[""],
+                strings_can_be_null=True
+            ))
 
-            # If the exact column name doesn't exist, try case-insensitive matching
-            column_lower = column.lower()
-            for col in df.columns:
-                if col.lower() == column_lower:
-                    return str(df[col].iloc[0])
+            # Stream batches until the first data row is available
+            for batch in reader:
+                if batch.num_rows:
+                    value = batch.column(0)[0].as_py()
+                    # Report empty cells the way pandas did
+                    return "nan" if value is None else value
 
-            # If column doesn't exist, list available columns
-            columns = ", ".join(df.columns)
-            return f"Column '{column}' not found. Available columns: {columns}"
+            return "Error reading CSV file: no data rows found"
 
         except Exception as e:
             return f"Error reading CSV file: {str(e)}"
\ No newline at end of file
@@ -2,9 +2,37 @@
 Handler for date calculation questions.
 """
 
-from datetime import datetime, timedelta
+import re
+from datetime import date
 from typing import Tuple, List
 
+# Precompiled date formats (strptime re-parses its format string on every call)
+_ISO_RE = re.compile(r'^(\d{4})-(\d{1,2})-(\d{1,2})$')
+_US_RE = re.compile(r'^(\d{1,2})/(\d{1,2})/(\d{4})$')
+
+
+def _parse_date(date_str: str) -> date:
+    """
+    Parse a date in YYYY-MM-DD or MM/DD/YYYY format.
+
+    Args:
+        date_str: Date string to parse
+
+    Returns:
+        The parsed date
+
+    Raises:
+        ValueError: If the string matches neither format or is not a valid date
+    """
+    date_str = date_str.strip()
+    match = _ISO_RE.match(date_str)
+    if match:
+        return date(int(match[1]), int(match[2]), int(match[3]))
+    match = _US_RE.match(date_str)
+    if match:
+        return date(int(match[3]), int(match[1]), int(match[2]))
+    raise ValueError(f"unrecognized date '{date_str}'")
+
 
 class DateHandler:
     """Handler for questions involving date calculations."""
@@ -21,45 +49,40 @@ class DateHandler:
             The count of Wednesdays as a string
         """
         try:
-            # Parse dates
-            start_date = datetime.strptime(start_date_str, "%Y-%m-%d")
-            end_date = datetime.strptime(end_date_str, "%Y-%m-%d")
-            
-            # Initialize counter
-            count = 0
+            # Parse dates (YYYY-MM-DD or MM/DD/YYYY)
+            start_date = _parse_date(start_date_str)
+            end_date = _parse_date(end_date_str)
             
-            # Iterate through each day
-            current = start_date
-            while current <= end_date:
-                if current.weekday() == 2:  # Wednesday is 2 in Python's weekday()
-                    count += 1
-                current += timedelta(days=1)
-            
-            return str(count)
+            # Wednesday is 2 in Python's weekday()
+            return str(self._count_weekday(start_date, end_date, 2))
         
-        except ValueError:
-            # Try alternative date formats
-            try:
-                # Try MM/DD/YYYY format
-                start_date = datetime.strptime(start_date_str, "%m/%d/%Y")
-                end_date = datetime.strptime(end_date_str, "%m/%d/%Y")
-                
-                # Continue with the same logic as above
-                count = 0
-                current = start_date
-                while current <= end_date:
-                    if current.weekday() == 2:
-                        count += 1
-                    current += timedelta(days=1)
-                
-                return str(count)
-            
-            except Exception as e:
-                return f"Error parsing dates: {str(e)}. Please use YYYY-MM-DD format."
+        except ValueError as e:
+            return f"Error parsing dates: {str(e)}. Please use YYYY-MM-DD format."
         
         except Exception as e:
             return f"Error counting Wednesdays: {str(e)}"
     
+    def _count_weekday(self, start_date: date, end_date: date, weekday: int = 2) -> int:
+        """
+        Count occurrences of a weekday between two dates (inclusive).
+        
+        Args:
+            start_date: First date of the range
+            end_date: Last date of the range
+            weekday: Day of the week to count (Monday is 0)
+            
+        Returns:
+            The number of matching days
+        """
+        start_ord = start_date.toordinal()
+        end_ord = end_date.toordinal()
+        
+        # Ordinal day 1 is a Monday, so (ordinal - 1) % 7 is the weekday
+        first_ord = start_ord + (weekday - (start_ord - 1)) % 7
+        if first_ord > end_ord:
+            return 0
+        return (end_ord - first_ord) // 7 + 1
+    
     async def date_diff(self, date1_str: str, date2_str: str) -> str:
         """
         Calculate the difference between two dates in days.
@@ -72,8 +95,8 @@ class DateHandler:
             The difference in days as a string
         """
         try:
-            date1 = datetime.strptime(date1_str, "%Y-%m-%d")
-            date2 = datetime.strptime(date2_str, "%Y-%m-%d")
+            date1 = _parse_date(date1_str)
+            date2 = _parse_date(date2_str)
             
             diff = abs((date2 - date1).days)
             return str(diff)
@@ -3,9 +3,30 @@ Handler for HTML processing questions.
 """
 
 import re
-from bs4 import BeautifulSoup
+import functools
+from lxml import etree
+from lxml import html as lxml_html
+from lxml.cssselect import CSSSelector
 from typing import Optional, List, Dict, Any
 
+from app.utils.cache_utils import LRUCache, content_digest
+
+# Precompiled patterns for locating HTML content between markers
+_HTML_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'<div[^>]*>([\s\S]*?)</div>',
+    r'<html[^>]*>([\s\S]*?)</html>',
+    r'<!-- HTML content -->([\s\S]*?)<!--',
+    r'```html\s*([\s\S]*?)\s*```'
+))
+
+# Translate each CSS selector to XPath once and reuse it across calls; the
+# html translator matches tag and attribute names case-insensitively
+_css_selector = functools.lru_cache(maxsize=256)(functools.partial(CSSSelector, translator='html'))
+
+# Bounded caches of parsed trees (by content digest) and selector results
+_TREE_CACHE = LRUCache(maxsize=32)
+_RESULT_CACHE = LRUCache(maxsize=256)
+
 
 class HTMLProcessorHandler:
     """Handler for questions involving HTML processing and CSS selectors."""
@@ -49,49 +70,81 @@ class HTMLProcessorHandler:
             Result of the query
         """
         try:
-            # Parse the HTML
-            soup = BeautifulSoup(html_content, 'html.parser')
-
-            # Find elements matching the selector
-            elements = soup.select(selector)
-
-            if not elements:
-                return f"No elements found matching selector '{selector}'"
-
-            # If an attribute is specified, extract and process it
-            if attribute:
-                # Special case for data attributes
-                if attribute.startswith('data-'):
-                    # Check if we need to sum numeric values
-                    values = []
-                    for element in elements:
-                        attr_value = element.get(attribute)
-                        if attr_value:
-                            try:
-                                # Try to convert to number
-                                values.append(float(attr_value))
-                            except ValueError:
-                                values.append(attr_value)
-
-                    # If all values are numeric, sum them
-                    if values and all(isinstance(v, (int, float)) for v in values):
-                        total = sum(values)
+            # Reuse cached results and parsed trees for repeated documents
+            content_key = content_digest(html_content.encode('utf-8'))
+            result_key = (content_key, selector, attribute)
+            result = _RESULT_CACHE.get(result_key)
+            if result is not None:
+                return result
+
+            tree = _TREE_CACHE.get(content_key)
+            if tree is None:
+                # Parse the HTML with lxml's C parser
+                try:
+                    tree = lxml_html.document_fromstring(html_content)
+                except etree.ParserError:
+                    # lxml rejects empty documents, which simply contain no elements
+                    return f"No elements found matching selector '{selector}'"
+                _TREE_CACHE.put(content_key, tree)
+
+            result = self._query_tree(tree, selector, attribute)
+            _RESULT_CACHE.put(result_key, result)
+            return result
+
+        except Exception as e:
+            return f"Error processing HTML with selector: {str(e)}"
+
+    def _query_tree(self, tree: Any, selector: str, attribute: str = None) -> str:
+        """
+        Apply a CSS selector to a parsed HTML tree and extract information.
+
+        Args:
+            tree: Parsed lxml document
+            selector: CSS selector to use
+            attribute: Attribute to extract (optional)
+
+        Returns:
+            Result of the query
+        """
+        # Find elements matching the selector
+        elements = _css_selector(selector)(tree)
+
+        if not elements:
+            return f"No elements found matching selector '{selector}'"
+
+        # If an attribute is specified, extract and process it
+        if attribute:
+            # Special case for data attributes
+            if attribute.startswith('data-'):
+                raw_values = [value for value in (element.get(attribute) for element in elements) if value]
+
+                # If all values are numeric, sum them left to right so the
+                # float result matches the previous output exactly
+                if raw_values:
+                    try:
+                        total = sum(float(value) for value in raw_values)
                         # Return as integer if it's a whole number
                         if total.is_integer():
                             return str(int(total))
                         return str(total)
-                    else:
-                        return ", ".join(str(v) for v in values)
-                else:
-                    # Extract regular attribute values
-                    values = [element.get(attribute, "") for element in elements]
-                    return ", ".join(values)
+                    except ValueError:
+                        pass
+
+                # Otherwise list the values, showing numeric ones as floats
+                values = []
+                for attr_value in raw_values:
+                    try:
+                        values.append(float(attr_value))
+                    except ValueError:
+                        values.append(attr_value)
+                return ", ".join(str(v) for v in values)
             else:
-                # Just return the count if no attribute specified
-                return str(len(elements))
-
-        except Exception as e:
-            return f"Error processing HTML with selector: {str(e)}"
+                # Extract regular attribute values
+                values = [element.get(attribute, "") for element in elements]
+                return ", ".join(values)
+        else:
+            # Just return the count if no attribute specified
+            return str(len(elements))
 
     def _extract_hidden_html(self, text: str) -> Optional[str]:
         """
@@ -104,17 +157,14 @@ class HTMLProcessorHandler:
             Extracted HTML or None if not found
         """
         # Try to find HTML content between markers
-        html_patterns = [
-            r'<div[^>]*>([\s\S]*?)</div>',
-            r'<html[^>]*>([\s\S]*?)</html>',
-            r'<!-- HTML content -->([\s\S]*?)<!--',
-            r'```html\s*([\s\S]*?)\s*```'
-        ]
-
-        for pattern in html_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            if matches:
-                # Return the largest match (most likely the complete HTML)
-                return max(matches, key=len)
+        for pattern in _HTML_PATTERNS:
+            # Track the largest match (most likely the complete HTML) as we scan
+            best = None
+            for match in pattern.finditer(text):
+                content = match.group(1)
+                if best is None or len(content) > len(best):
+                    best = content
+            if best is not None:
+                return best
 
         return None
\ No newline at end of file
@@ -4,8 +4,31 @@ Handler for JSON manipulation questions.
 
 import json
 import re
+import orjson
 from typing import Dict, List, Any
 
+# Splits a key path like "data.results[0].name" into names and indices
+_KEYPATH_RE = re.compile(r'(\w+)|\[(\d+)\]')
+
+
+# A run of 19+ digits may be an integer wider than 64 bits, which orjson
+# silently reads as a float instead of rejecting
+_LONG_DIGITS_RE = re.compile(r'\d{19}')
+
+
+def _loads(json_str: str) -> Any:
+    """
+    Parse JSON with orjson, using the stdlib for input orjson would read
+    differently (possible integers wider than 64 bits) or rejects (NaN and
+    Infinity literals).
+    """
+    if _LONG_DIGITS_RE.search(json_str):
+        return json.loads(json_str)
+    try:
+        return orjson.loads(json_str)
+    except orjson.JSONDecodeError:
+        return json.loads(json_str)
+
 
 class JSONHandler:
     """Handler for questions involving JSON data processing."""
@@ -25,15 +48,22 @@ class JSONHandler:
             json_str = json_str.strip()
 
             # Parse the JSON data
-            data = json.loads(json_str)
+            data = _loads(json_str)
 
             # Check if the data is a list
             if not isinstance(data, list):
                 return f"Error: Expected a JSON array, got {type(data).__name__}"
 
-            # Determine sort keys based on the content
-            has_age = any('age' in item for item in data if isinstance(item, dict))
-            has_name = any('name' in item for item in data if isinstance(item, dict))
+            # Determine sort keys based on the content in a single pass
+            has_age = has_name = False
+            for item in data:
+                if isinstance(item, dict):
+                    if 'age' in item:
+                        has_age = True
+                    if 'name' in item:
+                        has_name = True
+                    if has_age and has_name:
+                        break
 
             # Sort by age and name if both exist
             if has_age and has_name:
@@ -48,7 +78,8 @@ class JSONHandler:
             else:
                 sorted_data = data
 
-            # Convert back to JSON with no whitespace
+            # Convert back to JSON with no whitespace; the stdlib serializer is
+            # kept so non-ASCII escaping and float formatting are unchanged
             return json.dumps(sorted_data, separators=(',', ':'))
 
         except json.JSONDecodeError as e:
@@ -69,10 +100,10 @@ class JSONHandler:
         """
         try:
             # Parse the JSON data
-            data = json.loads(json_str)
+            data = _loads(json_str)
 
             # Split the key path
-            parts = re.findall(r'(\w+)|\[(\d+)\]', key_path)
+            parts = _KEYPATH_RE.findall(key_path)
             value = data
 
             # Navigate through the path
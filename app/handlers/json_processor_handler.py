@@ -2,16 +2,55 @@
 Handler for JSON processing questions.
 """
 
-import json
 import re
+import json
+import asyncio
 import hashlib
 import httpx
+import orjson
 from typing import Optional, Dict, Any
 
+from app.utils.cache_utils import LRUCache, content_digest
+
+# One key=value pair per line; the key and value are stripped of surrounding
+# spaces and the value may itself contain '='
+_KV_RE = re.compile(r'^[^\S\n]*([^=\s][^=\n]*?)[^\S\n]*=[^\S\n]*(.*?)[^\S\n]*$', re.MULTILINE)
+
+# Values converted to JSON numbers and booleans
+_NUM_RE = re.compile(r'-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\Z')
+_BOOL_VALUES = {'true': True, 'false': False}
+
+
+def _read_text(file_path: str) -> str:
+    """Read a UTF-8 text file."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return f.read()
+
 
 class JSONProcessorHandler:
     """Handler for questions involving JSON processing and transformation."""
 
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
+        """
+        Initialize the handler.
+
+        Args:
+            http_client: Shared HTTP client; a private one is created if omitted
+        """
+        self.http = http_client or httpx.AsyncClient()
+        self._owns_http = http_client is None
+
+        # Hashes of previously seen JSON strings and key=value files, keyed by
+        # the kind of input and a digest of it
+        self._hash_cache = LRUCache(maxsize=1024)
+
+    async def aclose(self) -> None:
+        """
+        Close the HTTP client if this handler created it.
+        """
+        if self._owns_http:
+            await self.http.aclose()
+
     async def convert_keyvalue_to_json(self, file_path: str) -> str:
         """
         Convert a text file with key=value pairs to a JSON object.
@@ -23,26 +62,47 @@ class JSONProcessorHandler:
             The converted JSON string
         """
         try:
-            # Read the text file
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            # Extract key=value pairs
-            json_object = {}
-            for line in content.strip().split('\n'):
-                if '=' in line:
-                    key, value = line.split('=', 1)
-                    # Try to convert value to appropriate data type
-                    value = self._convert_value_type(value)
-                    json_object[key.strip()] = value
-
-            # Convert to JSON string
+            json_object = await self._parse_keyvalue_file(file_path)
+
+            # Convert to JSON string; the stdlib serializer handles integers
+            # wider than 64 bits and keeps the established float formatting
             json_string = json.dumps(json_object, separators=(',', ':'))
             return json_string
 
         except Exception as e:
             return f"Error converting key-value pairs to JSON: {str(e)}"
 
+    async def _parse_keyvalue_file(self, file_path: str) -> Dict[str, Any]:
+        """
+        Parse a text file with key=value pairs into a dictionary.
+
+        Args:
+            file_path: Path to the text file
+
+        Returns:
+            Dictionary of keys to converted values
+        """
+        # Read the text file without blocking the event loop
+        content = await asyncio.to_thread(_read_text, file_path)
+        return self._parse_keyvalue_text(content)
+
+    def _parse_keyvalue_text(self, content: str) -> Dict[str, Any]:
+        """
+        Parse key=value lines into a dictionary.
+
+        Args:
+            content: Text with one key=value pair per line
+
+        Returns:
+            Dictionary of keys to converted values
+        """
+        # Extract key=value pairs in one regex scan, converting each value
+        # to the appropriate data type
+        return {
+            match.group(1): self._convert_value_type(match.group(2))
+            for match in _KV_RE.finditer(content)
+        }
+
     def _convert_value_type(self, value: str) -> Any:
         """
         Convert string value to appropriate data type.
@@ -53,28 +113,29 @@ class JSONProcessorHandler:
         Returns:
             Converted value
         """
-        # Try to convert to number
-        if value.isdigit():
+        value = value.strip()
+
+        # Plain integers are the common numeric case and need no regex; only
+        # ASCII digits are accepted since int() rejects e.g. superscripts
+        digits = value[1:] if value[:1] == '-' else value
+        if digits.isdigit() and digits.isascii():
             return int(value)
 
-        try:
-            float_val = float(value)
-            return float_val
-        except ValueError:
-            pass
+        lowered = value.lower()
 
-        # Try to convert to boolean
-        if value.lower() == 'true':
-            return True
-        if value.lower() == 'false':
-            return False
+        # Booleans are a dictionary lookup
+        if lowered in _BOOL_VALUES:
+            return _BOOL_VALUES[lowered]
+
+        # Numbers are recognized up front instead of by catching float() errors
+        if _NUM_RE.match(value):
+            if '.' in value or 'e' in lowered:
+                return float(value)
+            return int(value)
 
         # Try to convert to array
         if ',' in value:
-            # Check if it might be an array
-            items = value.split(',')
-            if len(items) > 1:
-                return [item.strip() for item in items]
+            return [item.strip() for item in value.split(',')]
 
         # Default to string
         return value
@@ -89,34 +150,55 @@ class JSONProcessorHandler:
         Returns:
             Hash result
         """
+        # Re-submitted inputs short-circuit on a cheap digest of the string
+        cache_key = ("json", content_digest(json_string.encode('utf-8')))
+        hash_value = self._hash_cache.get(cache_key)
+        if hash_value is not None:
+            return hash_value
+
+        # Calculate it locally (same algorithm as the website); this is the
+        # normal path for any valid JSON string
         try:
-            # First, try to calculate it locally (same algorithm as the website)
-            try:
-                # This tries to mimic the website's hashing by normalizing JSON first
-                json_obj = json.loads(json_string)
-                normalized = json.dumps(json_obj, sort_keys=True, separators=(',', ':'))
-                hash_value = hashlib.sha256(normalized.encode('utf-8')).hexdigest()
-                return hash_value
-            except Exception as e:
-                print(f"Local hash calculation failed: {str(e)}")
-
-            # If local calculation fails, try to fetch from service
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    url="https://tools-in-data-science.pages.dev/api/jsonhash",
-                    json={"data": json_string},
-                    timeout=10.0
-                )
-
-                if response.status_code == 200:
-                    result = response.json()
-                    return result.get("hash", "Error: No hash in response")
-                else:
-                    return f"Error from hash service: {response.status_code}"
+            hash_value = self._hash_json_object(json.loads(json_string))
+        except (ValueError, TypeError) as e:
+            print(f"Local hash calculation failed: {str(e)}")
+        else:
+            self._hash_cache.put(cache_key, hash_value)
+            return hash_value
+
+        # Only input the local parser rejects is sent to the service
+        try:
+            response = await self.http.post(
+                url="https://tools-in-data-science.pages.dev/api/jsonhash",
+                content=orjson.dumps({"data": json_string}),
+                headers={"Content-Type": "application/json"},
+                timeout=10.0
+            )
+
+            if response.status_code == 200:
+                result = orjson.loads(response.content)
+                return result.get("hash", "Error: No hash in response")
+            else:
+                return f"Error from hash service: {response.status_code}"
 
         except Exception as e:
             return f"Error calculating JSON hash: {str(e)}"
 
+    def _hash_json_object(self, json_obj: Any) -> str:
+        """
+        Hash a parsed JSON value the way the jsonhash website does.
+
+        Args:
+            json_obj: Parsed JSON value
+
+        Returns:
+            SHA-256 hex digest of the key-sorted, compact serialization
+        """
+        # The stdlib serializer is used because its output defines the hash:
+        # orjson would read wide integers as floats and format floats differently
+        normalized = json.dumps(json_obj, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
     async def process_multi_cursor_json(self, file_path: str) -> str:
         """
         Process a multi-cursor JSON question.
@@ -128,13 +210,19 @@ class JSONProcessorHandler:
             The hash result
         """
         try:
-            # Convert key=value pairs to JSON
-            json_string = await self.convert_keyvalue_to_json(file_path)
+            content = await asyncio.to_thread(_read_text, file_path)
 
-            # Get hash for the JSON
-            hash_result = await self.get_json_hash(json_string)
+            # Re-submitted files short-circuit on a cheap digest of their text
+            cache_key = ("keyvalue", content_digest(content.encode('utf-8')))
+            hash_value = self._hash_cache.get(cache_key)
+            if hash_value is not None:
+                return hash_value
 
-            return hash_result
+            # Convert key=value pairs to JSON and hash the object directly,
+            # skipping the serialize/decode/re-parse round trip through a JSON string
+            hash_value = self._hash_json_object(self._parse_keyvalue_text(content))
+            self._hash_cache.put(cache_key, hash_value)
+            return hash_value
 
         except Exception as e:
             return f"Error processing multi-cursor JSON: {str(e)}"
\ No newline at end of file
@@ -3,19 +3,48 @@ Main FastAPI application for the TDS Assignment Solver.
 """
 
 import os
-from fastapi import FastAPI, UploadFile, Form, File, HTTPException, BackgroundTasks
+from contextlib import asynccontextmanager
+import httpx
+from fastapi import FastAPI, UploadFile, Form, File, HTTPException, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
 import shutil
 from typing import Optional
 
 from app.question_processor import QuestionProcessor
+from app.utils.ai_client import AIClient
 from app.utils.file_utils import save_upload_file, cleanup_temp_file
 
+# Get AI Proxy token from environment variable
+ai_proxy_token = os.environ.get("AIPROXY_TOKEN")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Share one pooled HTTP client and question processor across all requests."""
+    # HTTP/2 multiplexes concurrent AI proxy calls over one TLS connection
+    app.state.http = httpx.AsyncClient(
+        http2=True,
+        timeout=60.0,
+        limits=httpx.Limits(max_keepalive_connections=20, keepalive_expiry=30),
+    )
+
+    # Initialize question processor with AI proxy token
+    app.state.processor = QuestionProcessor(ai_proxy_token, app.state.http)
+
+    try:
+        yield
+    finally:
+        await app.state.processor.aclose()
+        await app.state.http.aclose()
+        await AIClient.aclose()
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="TDS Assignment Solver",
     description="AI-powered API for solving TDS graded assignment questions",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -27,12 +56,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Get AI Proxy token from environment variable
-ai_proxy_token = os.environ.get("AIPROXY_TOKEN")
-
-# Initialize question processor with AI proxy token
-processor = QuestionProcessor(ai_proxy_token)
-
 
 @app.get("/")
 async def root():
@@ -47,6 +70,7 @@ async def root():
 
 @app.post("/api/")
 async def answer_question(
+    request: Request,
     background_tasks: BackgroundTasks,
     question: str = Form(...),
     file: Optional[UploadFile] = File(None),
@@ -69,7 +93,7 @@ async def answer_question(
             temp_file_path = await save_upload_file(file)
 
         # Process the question using the AI-powered question processor
-        answer = await processor.process_question(question, temp_file_path)
+        answer = await request.app.state.processor.process_question(question, temp_file_path)
 
         return {"answer": answer}
 
@@ -85,4 +109,13 @@ async def answer_question(
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        # "auto" picks uvloop and httptools when installed; uvloop is not
+        # available on Windows
+        loop="auto",
+        http="auto",
+        workers=max(2, os.cpu_count() or 1),
+    )
\ No newline at end of file
@@ -5,9 +5,12 @@ AI-powered processor that analyzes and solves TDS assignment questions.
 
 import re
 import os
+import shutil
+import asyncio
+import tempfile
 import httpx
-import json
-from typing import Dict, List, Optional, Tuple, Any
+import orjson
+from typing import Dict, List, Optional, Set, Tuple, Any
 
 from app.handlers.csv_handler import CSVHandler
 from app.handlers.date_handler import DateHandler
@@ -16,7 +19,96 @@ from app.handlers.file_handler import FileHandler
 from app.handlers.command_handler import CommandHandler
 from app.handlers.json_processor_handler import JSONProcessorHandler
 from app.utils.text_utils import extract_pattern
-from app.utils.file_utils import extract_from_zip, find_file_by_extension
+from app.utils.cache_utils import LRUCache, content_digest
+from app.utils.file_utils import extract_from_zip, file_fingerprint, find_file_by_extension
+
+# Maximum number of characters of file content passed on to the AI
+MAX_FILE_CONTENT_LENGTH = 8000
+
+# Routing keywords found in a single scan; the lookahead reports overlapping
+# hits such as "hash" inside "jsonhash"
+_ROUTING_KEYWORDS_RE = re.compile(r'(?=(npx|prettier|sha256sum|multi-cursor|jsonhash|json|hash))')
+
+# Patterns used to pull the answer out of a free-form AI response
+_ANSWER_PREFIX_RE = re.compile(r'^(?:answer|the answer is|result):(.*)$', re.IGNORECASE | re.MULTILINE)
+_CODE_BLOCK_RE = re.compile(r'^```[^\n]*\n(.*?)(?:^```|\Z)', re.MULTILINE | re.DOTALL)
+_INTRO_RE = re.compile(r"here's|to solve|i'll|let me|first|based on", re.IGNORECASE)
+
+# Static prompt text, built once; only the per-request parts are formatted in
+_ANALYSIS_PROMPT_TEMPLATE = """You are an expert data science tool assistant that solves TDS (Tools in Data Science) assignment questions.
+
+Please analyze this question from a TDS graded assignment:
+
+Question: {question}
+
+{file_note}The question might involve various tasks including:
+- Running commands (like npx, sha256sum) and reporting the output
+- Extracting data from CSV files
+- Counting dates (like Wednesdays between date ranges)
+- Sorting JSON data
+- Calculating file hashes
+- Working with GitHub URLs
+- Working with Docker Hub
+- Finding information in specific columns
+- Converting key-value pairs to JSON objects
+- Etc.
+
+Your task is to analyze the question and determine:
+1. What type of question this is
+2. What actions are needed to solve it
+3. What specific calculations or extractions are needed
+4. If you already know the exact answer, provide it
+
+Pay special attention to questions involving command execution, like running npx, prettier, or sha256sum.
+If the question mentions running a command on a file, identify it as a command_execution type.
+
+Also look for questions about multi-cursor operations, JSON conversions, or anything involving jsonhash.
+
+Be specific and precise in your analysis.
+"""
+
+_FINAL_PROMPT_TEMPLATE = """You are an expert at solving TDS assignment questions. I need to solve this question:
+
+{question}
+
+{context}Please provide ONLY the answer without any explanation. The answer should be directly usable as a submission for the assignment question. 
+
+Do not include phrases like "The answer is" or "Here's the answer". Just provide the exact answer.
+"""
+
+
+def _strict_json_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Adapt an object schema for strict structured outputs.
+
+    Strict mode requires every property to be listed as required, so optional
+    properties are made nullable instead.
+    """
+    required = set(schema.get("required", ()))
+    properties = {
+        name: prop if name in required else {**prop, "type": [prop["type"], "null"]}
+        for name, prop in schema["properties"].items()
+    }
+    return {**schema, "properties": properties, "required": list(properties), "additionalProperties": False}
+
+
+def _retrieve_task_exception(task: "asyncio.Future") -> None:
+    """Mark a background task's exception as retrieved so it is not logged."""
+    if not task.cancelled():
+        task.exception()
+
+
+def _extraction_usable(task: "asyncio.Future") -> bool:
+    """Check that a finished ZIP extraction succeeded and its directory still exists."""
+    return not task.cancelled() and task.exception() is None and os.path.isdir(task.result()[0])
+
+
+def _remove_extraction(digest: bytes, task: "asyncio.Future") -> None:
+    """Delete the directory of a ZIP extraction dropped from the cache."""
+    if not task.done():
+        task.add_done_callback(lambda done: _remove_extraction(digest, done))
+    elif not task.cancelled() and task.exception() is None:
+        shutil.rmtree(task.result()[0], ignore_errors=True)
 
 
 class QuestionProcessor:
@@ -25,33 +117,48 @@ class QuestionProcessor:
     using AI and uses specialized handlers to process specific tasks.
     """
 
-    def __init__(self, ai_proxy_token: Optional[str] = None):
+    def __init__(self, ai_proxy_token: Optional[str] = None, http_client: Optional[httpx.AsyncClient] = None):
         """
         Initialize the question processor with an AI proxy token.
 
         Args:
             ai_proxy_token: API token for the AI proxy service
+            http_client: Shared HTTP client; a private one is created if omitted
         """
+        # Reuse one connection pool for all outbound requests
+        self.http = http_client or httpx.AsyncClient()
+        self._owns_http = http_client is None
+
         # Initialize specialized handlers
         self.csv_handler = CSVHandler()
         self.date_handler = DateHandler()
         self.json_handler = JSONHandler()
         self.file_handler = FileHandler()
         self.command_handler = CommandHandler()
-        self.json_processor_handler = JSONProcessorHandler()
+        self.json_processor_handler = JSONProcessorHandler(self.http)
+
+        # Successful question analyses, keyed by a digest of the analysis prompt
+        self._analysis_cache = LRUCache(maxsize=512)
+
+        # Extractions of recently uploaded ZIP files, keyed by content digest.
+        # Requests hold a lease on each extraction they use, and an evicted
+        # extraction is only deleted once its last lease is released.
+        self._zip_cache = LRUCache(maxsize=16, on_evict=self._evict_extraction)
+        self._zip_leases: Dict["asyncio.Future", int] = {}
+        self._zip_evicted: Set["asyncio.Future"] = set()
 
         # Set up AI
-        self.ai_proxy_token = ai_proxy_token or os.environ.get("AIPROXY_TOKEN")
-        self.ai_proxy_url = "http://aiproxy.sanand.workers.dev/openai/v1/chat/completions"
+        self.ai_proxy_token: Optional[str] = ai_proxy_token or os.environ.get("AIPROXY_TOKEN")
+        self.ai_proxy_url = "https://aiproxy.sanand.workers.dev/openai/v1/chat/completions"
 
         # Configure request headers
-        self.headers = {
+        self.headers: Dict[str, str] = {
             "Authorization": f"Bearer {self.ai_proxy_token}" if self.ai_proxy_token else "",
             "Content-Type": "application/json",
         }
 
         # Function definition for question analysis
-        self.question_analysis_function = {
+        self.question_analysis_function: Dict[str, Any] = {
             "name": "analyze_question",
             "description": "Analyze a TDS (Tools in Data Science) assignment question to determine the best approach to solve it",
             "parameters": {
@@ -101,6 +208,19 @@ class QuestionProcessor:
             }
         }
 
+        # Strict structured-output format derived from the same schema, so the
+        # reply content is the analysis object rather than a tool call whose
+        # arguments need a second decode
+        self.question_analysis_format: Dict[str, Any] = {
+            "type": "json_schema",
+            "json_schema": {
+                "name": self.question_analysis_function["name"],
+                "description": self.question_analysis_function["description"],
+                "schema": _strict_json_schema(self.question_analysis_function["parameters"]),
+                "strict": True
+            }
+        }
+
     async def process_question(self, question: str, file_path: Optional[str] = None) -> str:
         """
         Process a question using AI and specialized handlers as needed.
@@ -114,64 +234,106 @@ class QuestionProcessor:
         """
         # Handle specific patterns directly before AI analysis
         # This helps with cases where the AI might not correctly identify question types
+        keywords = self._find_keywords(question)
 
         # Command execution for npx prettier and sha256sum
-        if file_path and (
-            "npx" in question.lower() and "prettier" in question.lower() and "sha256sum" in question.lower()
-        ):
+        if file_path and {"npx", "prettier", "sha256sum"} <= keywords:
             return await self.command_handler.test_npx_prettier(file_path)
 
         # Multi-cursor JSON processing
         if file_path and (
-            "multi-cursor" in question.lower() and "json" in question.lower() and
-            ("jsonhash" in question.lower() or "hash" in question.lower())
+            "multi-cursor" in keywords and "json" in keywords and
+            ("jsonhash" in keywords or "hash" in keywords)
         ):
             return await self.json_processor_handler.process_multi_cursor_json(file_path)
 
-        # First, analyze the question with AI to determine approach
-        analysis = await self._analyze_question_with_ai(question, file_path)
-
-        # Check if we need to process a file
-        if file_path and "process_file" in analysis.get("actions", []):
-            file_content = await self._process_file(file_path, analysis)
+        # Extractions used by this request, released when it finishes
+        leases: List["asyncio.Future"] = []
+        zip_task = None
 
-            # Update the analysis with file content
-            if file_content:
-                analysis["file_content"] = file_content
-
-        # Process command execution if needed
-        if "execute_command" in analysis.get("actions", []):
-            return await self.command_handler.process_command_question(question, file_path)
-
-        # Process JSON processing if needed
-        if "process_json" in analysis.get("actions", []) and file_path:
-            if "multi-cursor" in question.lower() and "jsonhash" in question.lower():
-                return await self.json_processor_handler.process_multi_cursor_json(file_path)
-
-        # Process specialized calculations if needed
-        if "specialized_calculation" in analysis.get("actions", []):
-            calculation_type = analysis.get("calculation_type")
-
-            if calculation_type == "count_wednesdays":
-                date_range = analysis.get("date_range")
-                if date_range and len(date_range) == 2:
-                    return await self.date_handler.count_wednesdays(date_range[0], date_range[1])
+        try:
+            # First, analyze the question with AI to determine approach. The uploaded
+            # file is read (and a ZIP extracted) while the AI request is in flight.
+            analysis_task = asyncio.create_task(self._analyze_question_with_ai(question, file_path))
+            file_task = None
+            if file_path:
+                file_task = asyncio.create_task(self._read_file_raw(file_path, MAX_FILE_CONTENT_LENGTH + 1))
+                if file_path.lower().endswith('.zip'):
+                    zip_task = asyncio.create_task(self._extract_zip_cached(file_path, leases))
+                    # The extraction is cached for later requests even if this one
+                    # never uses it, so its failure must not go unretrieved
+                    zip_task.add_done_callback(_retrieve_task_exception)
+
+            if file_task:
+                analysis, file_text = await asyncio.gather(analysis_task, file_task)
+            else:
+                analysis, file_text = await analysis_task, None
+            actions = {action for action in analysis.get("actions") or () if isinstance(action, str)}
+
+            # Check if we need to process a file
+            if file_path and "process_file" in actions:
+                file_content = await self._process_file(file_path, analysis, file_text, zip_task, leases)
+
+                # Update the analysis with file content
+                if file_content:
+                    analysis["file_content"] = file_content
+
+            # Process command execution if needed
+            if "execute_command" in actions:
+                return await self.command_handler.process_command_question(question, file_path)
+
+            # Process JSON processing if needed
+            if "process_json" in actions and file_path:
+                if "multi-cursor" in keywords and "jsonhash" in keywords:
+                    return await self.json_processor_handler.process_multi_cursor_json(file_path)
+
+            # Process specialized calculations if needed
+            if "specialized_calculation" in actions:
+                calculation_type = analysis.get("calculation_type")
+
+                if calculation_type == "count_wednesdays":
+                    date_range = analysis.get("date_range")
+                    if date_range and len(date_range) == 2:
+                        return await self.date_handler.count_wednesdays(date_range[0], date_range[1])
+
+                elif calculation_type == "json_sorting":
+                    json_str = analysis.get("json_data")
+                    if json_str:
+                        return await self.json_handler.sort_json(json_str)
+
+            # If we have a direct answer from analysis, use it
+            if "direct_answer" in analysis and analysis["direct_answer"]:
+                return analysis["direct_answer"]
+
+            # Otherwise, get final answer from AI with all available information
+            return await self._get_final_answer_with_ai(question, analysis)
+
+        finally:
+            if zip_task is not None and not zip_task.done():
+                # A speculative extraction still running takes its lease later
+                zip_task.add_done_callback(lambda _: self._release_extractions(leases))
+            else:
+                self._release_extractions(leases)
 
-            elif calculation_type == "json_sorting":
-                json_str = analysis.get("json_data")
-                if json_str:
-                    return await self.json_handler.sort_json(json_str)
+    def _find_keywords(self, question: str) -> Set[str]:
+        """
+        Find the routing keywords present in a question.
 
-        # If we have a direct answer from analysis, use it
-        if "direct_answer" in analysis and analysis["direct_answer"]:
-            return analysis["direct_answer"]
+        Args:
+            question: The question text
 
-        # Otherwise, get final answer from AI with all available information
-        return await self._get_final_answer_with_ai(question, analysis)
+        Returns:
+            Set of matched keywords
+        """
+        keywords = set(_ROUTING_KEYWORDS_RE.findall(question.lower()))
+        # "jsonhash" is matched in preference to "json" at the same position
+        if "jsonhash" in keywords:
+            keywords.add("json")
+        return keywords
 
     async def _analyze_question_with_ai(self, question: str, file_path: Optional[str] = None) -> Dict[str, Any]:
         """
-        Use AI to analyze the question and determine the best approach using function calling.
+        Use AI to analyze the question and determine the best approach using structured output.
 
         Args:
             question: The question text
@@ -189,51 +351,51 @@ class QuestionProcessor:
         # Create a prompt for analysis
         prompt = self._create_analysis_prompt(question, file_path)
 
+        # Repeated questions (with the same uploaded file name) reuse the earlier
+        # analysis; callers add to the dict, so each gets its own copy
+        cache_key = content_digest(prompt.encode('utf-8'))
+        cached = self._analysis_cache.get(cache_key)
+        if cached is not None:
+            return dict(cached)
+
         try:
             # Make the API request
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    url=self.ai_proxy_url,
-                    headers=self.headers,
-                    json={
-                        "model": "gpt-4o-mini",
-                        "messages": [
-                            {
-                                "role": "system",
-                                "content": "You are an AI assistant that helps solve questions from the Tools in Data Science course. Your task is to analyze questions and determine the best approach to solve them."
-                            },
-                            {
-                                "role": "user",
-                                "content": prompt
-                            }
-                        ],
-                        "tools": [
-                            {
-                                "type": "function",
-                                "function": self.question_analysis_function
-                            }
-                        ],
-                        "tool_choice": "auto"
-                    },
-                    timeout=60.0
-                )
+            response = await self.http.post(
+                url=self.ai_proxy_url,
+                headers=self.headers,
+                content=orjson.dumps({
+                    "model": "gpt-4o-mini",
+                    "messages": [
+                        {
+                            "role": "system",
+                            "content": "You are an AI assistant that helps solve questions from the Tools in Data Science course. Your task is to analyze questions and determine the best approach to solve them."
+                        },
+                        {
+                            "role": "user",
+                            "content": prompt
+                        }
+                    ],
+                    "response_format": self.question_analysis_format
+                }),
+                timeout=60.0
+            )
 
             # Check if the request was successful
             if response.status_code == 200:
-                result = response.json()
+                result = orjson.loads(response.content)
 
-                # Extract the analysis from the response
-                if "choices" in result and len(result["choices"]) > 0:
-                    message = result["choices"][0]["message"]
+                # The structured output is the analysis itself, encoded once
+                choices = result.get("choices")
+                content = choices[0]["message"].get("content") if choices else None
+                if content:
+                    try:
+                        analysis = orjson.loads(content)
+                    except orjson.JSONDecodeError:
+                        return {"error": "Failed to parse AI response", "actions": []}
 
-                    if "tool_calls" in message and len(message["tool_calls"]) > 0:
-                        function_call = message["tool_calls"][0]["function"]
-                        if "arguments" in function_call:
-                            try:
-                                analysis = json.loads(function_call["arguments"])
-                                return analysis
-                            except json.JSONDecodeError:
-                                return {"error": "Failed to parse AI response", "actions": []}
+                    if isinstance(analysis, dict):
+                        self._analysis_cache.put(cache_key, analysis)
+                        return dict(analysis)
 
                 return {"error": "Failed to extract analysis from AI response", "actions": []}
             else:
@@ -242,30 +404,34 @@ class QuestionProcessor:
         except Exception as e:
             return {"error": f"Error connecting to AI service: {str(e)}", "actions": []}
 
-    async def _process_file(self, file_path: str, analysis: Dict[str, Any]) -> Optional[str]:
+    async def _process_file(self, file_path: str, analysis: Dict[str, Any],
+                            file_text: Optional[str] = None,
+                            zip_task: Optional["asyncio.Task[Tuple[str, Optional[str]]]"] = None,
+                            leases: Optional[List["asyncio.Future"]] = None) -> Optional[str]:
         """
         Process an uploaded file based on analysis.
 
         Args:
             file_path: Path to the file
             analysis: Question analysis from AI
+            file_text: File content already read by process_question, if any
+            zip_task: Extraction of the file already started by process_question, if any
+            leases: Collects the ZIP extractions used, for the caller to release
 
         Returns:
             File content or extracted data as needed
         """
         # Check file type
-        question_type = analysis.get("question_type", "unknown")
+        question_type = analysis.get("question_type") or "unknown"
 
         if question_type == "csv_extraction":
-            column = analysis.get("column_to_extract", "answer")
+            column = analysis.get("column_to_extract") or "answer"
 
             # If it's a ZIP file, extract it first
             if file_path.lower().endswith('.zip'):
-                # Extract the ZIP file
-                temp_dir = await extract_from_zip(file_path)
-
-                # Find CSV file
-                csv_file = await find_file_by_extension(temp_dir, '.csv')
+                # Extract the ZIP file, reusing the speculative extraction if
+                # started and the cached extraction of an identical upload
+                _, csv_file = await (zip_task or self._extract_zip_cached(file_path, leases))
 
                 if csv_file:
                     return await self.csv_handler.extract_from_csv(csv_file, column)
@@ -274,19 +440,126 @@ class QuestionProcessor:
             elif file_path.lower().endswith('.csv'):
                 return await self.csv_handler.extract_from_csv(file_path, column)
 
-        # For other file types, just read the content
-        try:
+        # For other file types, just use the content. Only one character past
+        # the limit is ever read, which is enough to know truncation is needed,
+        # so memory use is bounded regardless of the upload size.
+        max_length = MAX_FILE_CONTENT_LENGTH
+        if file_text is None:
+            file_text = await self._read_file_raw(file_path, max_length + 1)
+
+        # Truncate if too large
+        if len(file_text) > max_length:
+            return file_text[:max_length] + "\n...[content truncated]..."
+        return file_text
+
+    async def _read_file_raw(self, file_path: str, max_chars: int = -1) -> str:
+        """
+        Read a file as text without blocking the event loop.
+
+        Args:
+            file_path: Path to the file
+            max_chars: Maximum number of characters to read (-1 for all)
+
+        Returns:
+            File content, or an error message if it could not be read
+        """
+        def read() -> str:
             with open(file_path, 'r', errors='ignore') as f:
-                content = f.read()
+                return f.read(max_chars)
 
-                # Truncate if too large
-                max_length = 8000
-                if len(content) > max_length:
-                    return content[:max_length] + "\n...[content truncated]..."
-                return content
+        try:
+            return await asyncio.to_thread(read)
         except Exception as e:
             return f"Error reading file: {str(e)}"
 
+    async def _extract_zip_cached(self, zip_path: str,
+                                  leases: Optional[List["asyncio.Future"]] = None) -> Tuple[str, Optional[str]]:
+        """
+        Extract a ZIP file, reusing the extraction of an identical earlier upload.
+
+        Args:
+            zip_path: Path to the ZIP file
+            leases: If given, a lease on the extraction is taken and appended
+                here; the caller must pass the list to _release_extractions
+
+        Returns:
+            Tuple of (extraction directory, first CSV file in it or None)
+        """
+        digest = await file_fingerprint(zip_path)
+
+        # Concurrent uploads of the same archive share one extraction task
+        task = self._zip_cache.get(digest)
+        if task is None or (task.done() and not _extraction_usable(task)):
+            task = asyncio.ensure_future(self._extract_zip(zip_path))
+            self._zip_cache.put(digest, task)
+
+        if leases is not None:
+            self._zip_leases[task] = self._zip_leases.get(task, 0) + 1
+            leases.append(task)
+
+        try:
+            return await asyncio.shield(task)
+        except Exception:
+            # Do not cache failed extractions
+            if self._zip_cache.get(digest) is task:
+                self._zip_cache.pop(digest)
+            raise
+
+    def _evict_extraction(self, digest: bytes, task: "asyncio.Future") -> None:
+        """
+        Delete an extraction dropped from the cache, or defer that until the
+        requests still using it release their leases.
+        """
+        if task in self._zip_leases:
+            self._zip_evicted.add(task)
+        else:
+            _remove_extraction(digest, task)
+
+    def _release_extractions(self, leases: List["asyncio.Future"]) -> None:
+        """
+        Release a request's leases, deleting evicted extractions no longer in use.
+
+        Args:
+            leases: Extractions leased by _extract_zip_cached
+        """
+        for task in leases:
+            count = self._zip_leases.pop(task) - 1
+            if count:
+                self._zip_leases[task] = count
+            elif task in self._zip_evicted:
+                self._zip_evicted.discard(task)
+                _remove_extraction(None, task)
+        leases.clear()
+
+    async def _extract_zip(self, zip_path: str) -> Tuple[str, Optional[str]]:
+        """
+        Extract a ZIP file and locate the CSV file inside it.
+
+        Args:
+            zip_path: Path to the ZIP file
+
+        Returns:
+            Tuple of (extraction directory, first CSV file in it or None)
+        """
+        temp_dir = tempfile.mkdtemp()
+        try:
+            await extract_from_zip(zip_path, temp_dir)
+            csv_file = await find_file_by_extension(temp_dir, '.csv')
+        except BaseException:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            raise
+        return temp_dir, csv_file
+
+    async def aclose(self) -> None:
+        """
+        Remove the cached ZIP extractions and close the HTTP client if this
+        processor created it.
+        """
+        self._zip_cache.clear()
+        await self.json_processor_handler.aclose()
+        if self._owns_http:
+            await self.http.aclose()
+
     async def _get_final_answer_with_ai(self, question: str, analysis: Dict[str, Any]) -> str:
         """
         Get the final answer using AI with all available information.
@@ -306,31 +579,30 @@ class QuestionProcessor:
 
         try:
             # Make the API request
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    url=self.ai_proxy_url,
-                    headers=self.headers,
-                    json={
-                        "model": "gpt-4o-mini",
-                        "messages": [
-                            {
-                                "role": "system",
-                                "content": "You are an AI assistant that helps solve questions from the Tools in Data Science course. Your answers should be concise, accurate, and directly provide the solution without explanation."
-                            },
-                            {
-                                "role": "user",
-                                "content": prompt
-                            }
-                        ],
-                        "max_tokens": 1000,
-                        "temperature": 0
-                    },
-                    timeout=60.0
-                )
+            response = await self.http.post(
+                url=self.ai_proxy_url,
+                headers=self.headers,
+                content=orjson.dumps({
+                    "model": "gpt-4o-mini",
+                    "messages": [
+                        {
+                            "role": "system",
+                            "content": "You are an AI assistant that helps solve questions from the Tools in Data Science course. Your answers should be concise, accurate, and directly provide the solution without explanation."
+                        },
+                        {
+                            "role": "user",
+                            "content": prompt
+                        }
+                    ],
+                    "max_tokens": 1000,
+                    "temperature": 0
+                }),
+                timeout=60.0
+            )
 
             # Check if the request was successful
             if response.status_code == 200:
-                result = response.json()
+                result = orjson.loads(response.content)
 
                 # Extract the answer from the response
                 if "choices" in result and len(result["choices"]) > 0:
@@ -355,43 +627,8 @@ class QuestionProcessor:
         Returns:
             Analysis prompt
         """
-        prompt = """You are an expert data science tool assistant that solves TDS (Tools in Data Science) assignment questions.
-
-Please analyze this question from a TDS graded assignment:
-
-Question: """
-        prompt += question + "\n\n"
-
-        if file_path:
-            prompt += f"A file was uploaded named: {os.path.basename(file_path)}\n\n"
-
-        prompt += """The question might involve various tasks including:
-- Running commands (like npx, sha256sum) and reporting the output
-- Extracting data from CSV files
-- Counting dates (like Wednesdays between date ranges)
-- Sorting JSON data
-- Calculating file hashes
-- Working with GitHub URLs
-- Working with Docker Hub
-- Finding information in specific columns
-- Converting key-value pairs to JSON objects
-- Etc.
-
-Your task is to analyze the question and determine:
-1. What type of question this is
-2. What actions are needed to solve it
-3. What specific calculations or extractions are needed
-4. If you already know the exact answer, provide it
-
-Pay special attention to questions involving command execution, like running npx, prettier, or sha256sum.
-If the question mentions running a command on a file, identify it as a command_execution type.
-
-Also look for questions about multi-cursor operations, JSON conversions, or anything involving jsonhash.
-
-Be specific and precise in your analysis.
-"""
-
-        return prompt
+        file_note = f"A file was uploaded named: {os.path.basename(file_path)}\n\n" if file_path else ""
+        return _ANALYSIS_PROMPT_TEMPLATE.format(question=question, file_note=file_note)
 
     def _create_final_prompt(self, question: str, analysis: Dict[str, Any]) -> str:
         """
@@ -404,32 +641,24 @@ Be specific and precise in your analysis.
         Returns:
             Final answer prompt
         """
-        prompt = """You are an expert at solving TDS assignment questions. I need to solve this question:
-
-"""
-        prompt += question + "\n\n"
+        # Collect the optional sections and join them once
+        context = []
 
         # Add file content if available
-        if "file_content" in analysis and analysis["file_content"]:
-            prompt += "Here is the content of the file:\n\n"
-            prompt += analysis["file_content"] + "\n\n"
+        if analysis.get("file_content"):
+            context.append(f"Here is the content of the file:\n\n{analysis['file_content']}\n\n")
 
         # Add error information if present
-        if "error" in analysis and analysis["error"]:
-            prompt += f"Note: There was an issue during processing: {analysis['error']}\n\n"
+        if analysis.get("error"):
+            context.append(f"Note: There was an issue during processing: {analysis['error']}\n\n")
 
         if "question_type" in analysis:
-            prompt += f"This appears to be a {analysis['question_type']} question.\n\n"
-
-        if "direct_answer" in analysis and analysis["direct_answer"]:
-            prompt += f"Based on the analysis, the answer might be: {analysis['direct_answer']}\n\n"
-
-        prompt += """Please provide ONLY the answer without any explanation. The answer should be directly usable as a submission for the assignment question. 
+            context.append(f"This appears to be a {analysis['question_type']} question.\n\n")
 
-Do not include phrases like "The answer is" or "Here's the answer". Just provide the exact answer.
-"""
+        if analysis.get("direct_answer"):
+            context.append(f"Based on the analysis, the answer might be: {analysis['direct_answer']}\n\n")
 
-        return prompt
+        return _FINAL_PROMPT_TEMPLATE.format(question=question, context="".join(context))
 
     def _extract_final_answer(self, response: str) -> str:
         """
@@ -442,42 +671,28 @@ Do not include phrases like "The answer is" or "Here's the answer". Just provide
             The extracted answer
         """
         # Remove any explanations or unnecessary text
-        lines = response.strip().split('\n')
+        text = response.strip()
 
         # If the response contains "Answer:" or similar, extract just that part
-        for i, line in enumerate(lines):
-            if line.lower().startswith(("answer:", "the answer is:", "result:")):
-                return line.split(":", 1)[1].strip()
+        match = _ANSWER_PREFIX_RE.search(text)
+        if match:
+            return match.group(1).strip()
 
-        # If there's a code block, extract it
-        if "```" in response:
-            code_blocks = []
-            in_code_block = False
+        # If there's a code block, extract it; every line is newline-terminated
+        # so an unclosed block still captures its last line
+        if "```" in text:
+            code_lines = []
+            for block in _CODE_BLOCK_RE.finditer(text + "\n"):
+                code_lines.extend(block.group(1).split("\n")[:-1])
 
-            for line in lines:
-                if line.startswith("```"):
-                    in_code_block = not in_code_block
-                    continue
-
-                if in_code_block:
-                    code_blocks.append(line)
-
-            if code_blocks:
-                return "\n".join(code_blocks)
+            if code_lines:
+                return "\n".join(code_lines)
 
         # Default to returning the full response if we can't extract a specific answer
         # But remove any introductory text
-        clean_lines = []
-        started = False
-
-        for line in lines:
-            # Skip introductory text
-            if not started and any(phrase in line.lower() for phrase in
-                                   ["here's", "to solve", "i'll", "let me", "first", "based on"]):
-                continue
-
-            started = True
-            clean_lines.append(line)
+        lines = text.split('\n')
+        start = next((i for i, line in enumerate(lines) if not _INTRO_RE.search(line)), len(lines))
+        clean_lines = lines[start:]
 
         if clean_lines:
             return "\n".join(clean_lines)
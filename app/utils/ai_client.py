@@ -2,10 +2,32 @@
 Client for interacting with AI services.
 """
 
-import json
+import asyncio
+import logging
 import httpx
+import orjson
 import os
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
+
+logger = logging.getLogger(__name__)
+
+# JSON payloads at least this large are decoded in a worker thread
+_OFFLOAD_PARSE_BYTES = 256 * 1024
+
+
+async def _loads(data: Union[bytes, str]) -> Any:
+    """
+    Decode JSON, moving large payloads off the event loop.
+
+    Args:
+        data: JSON document
+
+    Returns:
+        The decoded value
+    """
+    if len(data) >= _OFFLOAD_PARSE_BYTES:
+        return await asyncio.to_thread(orjson.loads, data)
+    return orjson.loads(data)
 
 
 class AIClient:
@@ -13,6 +35,9 @@ class AIClient:
     Client for making requests to AI services.
     """
 
+    # Connection pool shared by all instances, created on first use
+    _client: Optional[httpx.AsyncClient] = None
+
     def __init__(self, api_key: Optional[str] = None):
         """
         Initialize the AI client.
@@ -37,6 +62,31 @@ class AIClient:
         # Default model to use
         self.model = "gpt-3.5-turbo"
 
+    @classmethod
+    def _get_client(cls) -> httpx.AsyncClient:
+        """
+        Return the shared HTTP client, creating it on first use.
+
+        Returns:
+            An HTTP/2-capable client that keeps connections alive between calls
+        """
+        if cls._client is None or cls._client.is_closed:
+            cls._client = httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=20),
+                timeout=httpx.Timeout(30.0),
+            )
+        return cls._client
+
+    @classmethod
+    async def aclose(cls) -> None:
+        """
+        Close the shared HTTP client if it was created.
+        """
+        if cls._client is not None:
+            await cls._client.aclose()
+            cls._client = None
+
     async def call_basic(self, system_prompt: str, user_prompt: str,
                          temperature: float = 0.0) -> str:
         """
@@ -54,28 +104,28 @@ class AIClient:
             return "AI service API key not configured"
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    url=self.base_url,
-                    headers=self.headers,
-                    json={
-                        "model": self.model,
-                        "messages": [
-                            {"role": "system", "content": system_prompt},
-                            {"role": "user", "content": user_prompt}
-                        ],
-                        "temperature": temperature
-                    },
-                    timeout=30.0
-                )
-
-                # Check response status
-                if response.status_code == 200:
-                    result = response.json()
-                    return result["choices"][0]["message"]["content"]
-                else:
-                    error_info = response.json() if response.content else {"error": "Unknown error"}
-                    return f"Error from AI service: {response.status_code}, {error_info}"
+            client = self._get_client()
+            response = await client.post(
+                url=self.base_url,
+                headers=self.headers,
+                content=orjson.dumps({
+                    "model": self.model,
+                    "messages": [
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    "temperature": temperature
+                }),
+                timeout=30.0
+            )
+
+            # Check response status
+            if response.status_code == 200:
+                result = orjson.loads(response.content)
+                return result["choices"][0]["message"]["content"]
+            else:
+                error_info = orjson.loads(response.content) if response.content else {"error": "Unknown error"}
+                return f"Error from AI service: {response.status_code}, {error_info}"
 
         except Exception as e:
             return f"Error connecting to AI service: {str(e)}"
@@ -97,39 +147,39 @@ class AIClient:
             return None
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    url=self.base_url,
-                    headers=self.headers,
-                    json={
-                        "model": self.model,
-                        "messages": [
-                            {"role": "system", "content": system_prompt},
-                            {"role": "user", "content": user_prompt}
-                        ],
-                        "functions": [function_schema],
-                        "function_call": {"name": function_schema["name"]}
-                    },
-                    timeout=30.0
-                )
-
-                # Check response status
-                if response.status_code == 200:
-                    result = response.json()
-                    message = result["choices"][0]["message"]
-
-                    # Extract function call
-                    if "function_call" in message:
-                        function_call = message["function_call"]
-                        if "arguments" in function_call:
-                            try:
-                                return json.loads(function_call["arguments"])
-                            except json.JSONDecodeError:
-                                print("Error parsing function arguments")
-                                return None
-
-                return None
+            client = self._get_client()
+            response = await client.post(
+                url=self.base_url,
+                headers=self.headers,
+                content=orjson.dumps({
+                    "model": self.model,
+                    "messages": [
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    "functions": [function_schema],
+                    "function_call": {"name": function_schema["name"]}
+                }),
+                timeout=30.0
+            )
+
+            # Check response status
+            if response.status_code == 200:
+                result = await _loads(response.content)
+                message = result["choices"][0]["message"]
+
+                # Extract function call
+                if "function_call" in message:
+                    function_call = message["function_call"]
+                    if "arguments" in function_call:
+                        try:
+                            return await _loads(function_call["arguments"])
+                        except orjson.JSONDecodeError:
+                            logger.warning("Error parsing function arguments")
+                            return None
+
+            return None
 
         except Exception as e:
-            print(f"Error in function call: {str(e)}")
+            logger.exception("Error in function call: %s", e)
             return None
\ No newline at end of file
@@ -0,0 +1,118 @@
+"""
+Caching utilities.
+"""
+
+import hashlib
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+# Size in bytes of the content digests used as cache keys
+DIGEST_SIZE = 16
+
+
+def content_hasher() -> Any:
+    """
+    Create an incremental hasher for content fingerprints used as cache keys.
+
+    BLAKE2b is used because it is faster than SHA-256 in software and ships
+    with hashlib; fingerprints never leave the process, so the algorithm can
+    be changed here without affecting any output.
+
+    Returns:
+        A new hash object producing DIGEST_SIZE-byte digests
+    """
+    return hashlib.blake2b(digest_size=DIGEST_SIZE)
+
+
+def content_digest(data: bytes) -> bytes:
+    """
+    Compute a content fingerprint for use as a cache key.
+
+    Args:
+        data: Bytes to fingerprint
+
+    Returns:
+        DIGEST_SIZE-byte digest of the data
+    """
+    return hashlib.blake2b(data, digest_size=DIGEST_SIZE).digest()
+
+
+class LRUCache:
+    """
+    A size-bounded mapping that evicts the least recently used entry when full.
+    """
+
+    def __init__(self, maxsize: int = 128,
+                 on_evict: Optional[Callable[[Hashable, Any], None]] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries to keep
+            on_evict: Called with (key, value) for entries dropped to make room
+                or removed by clear()
+        """
+        self.maxsize = maxsize
+        self.on_evict = on_evict
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """
+        Return a cached value and mark it as most recently used.
+
+        Args:
+            key: Cache key
+            default: Value returned when the key is not cached
+
+        Returns:
+            The cached value or the default
+        """
+        try:
+            value = self._data[key]
+        except KeyError:
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Store a value, evicting the least recently used entry if the cache is full.
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            evicted_key, evicted_value = self._data.popitem(last=False)
+            if self.on_evict is not None:
+                self.on_evict(evicted_key, evicted_value)
+
+    def pop(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """
+        Remove a key and return its value.
+
+        Args:
+            key: Cache key
+            default: Value returned when the key is not cached
+
+        Returns:
+            The removed value or the default
+        """
+        return self._data.pop(key, default)
+
+    def clear(self) -> None:
+        """
+        Remove all entries, passing each one to the eviction callback.
+        """
+        while self._data:
+            key, value = self._data.popitem(last=False)
+            if self.on_evict is not None:
+                self.on_evict(key, value)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
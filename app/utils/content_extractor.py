@@ -5,6 +5,83 @@ Utilities for extracting specific content from text.
 import re
 from typing import Optional, List
 
+# Leading phrases like "The answer is" or "Here's the answer:"
+_ANS_PREFIX_RE = re.compile(r'^(the answer is|here\'s the answer|answer:|result:|solution:)', re.IGNORECASE)
+
+# Text that is quoted as a whole
+_QUOTE_RE = re.compile(r'^"(.*)"$')
+
+# Contents of a fenced code block
+_CODE_RE = re.compile(r'```(?:\w+)?\s*([\s\S]+?)\s*```')
+
+# Lowercased prefixes of lines that start an explanation section (after
+# leading whitespace); "explanation" additionally needs a following colon
+_EXPLANATION_PREFIXES = (
+    'i think',
+    'based on',
+    'according to',
+    'this is because',
+    'let me explain',
+    'to solve this'
+)
+
+# Supported date formats, each scanned separately so matches of different
+# formats may overlap and are returned grouped by format. Atomic groups and
+# possessive quantifiers never give back characters the next token could not
+# match anyway, so failed attempts end without backtracking.
+_DATE_RES = tuple(re.compile(p) for p in (
+    r'\d{4}-\d{2}-\d{2}',  # YYYY-MM-DD
+    r'\d{1,2}+/\d{1,2}+/\d{4}',  # MM/DD/YYYY
+    r'(?>Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*+ \d{1,2}+,?+ \d{4}'  # Month DD, YYYY
+))
+
+# JSON object in a code block; bare objects are found by _find_json_object
+_JSON_BLOCK_RE = re.compile(r'```(?:json)?\s*(\{[\s\S]*?\})\s*```')
+
+
+def _find_json_object(text: str) -> Optional[str]:
+    """
+    Find the first balanced {...} object in text with a single linear scan.
+
+    Braces inside double-quoted strings are ignored. If the text ends with an
+    object still open, the outermost object that did close is returned.
+
+    Args:
+        text: Text to search
+
+    Returns:
+        The object text or None if no braces balance
+    """
+    start = text.find('{')
+    if start < 0:
+        return None
+
+    open_positions = []
+    best = None
+    in_string = escaped = False
+
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '{':
+            open_positions.append(i)
+        elif char == '}' and open_positions:
+            opened = open_positions.pop()
+            if not open_positions:
+                return text[opened:i + 1]
+            if best is None or opened < best[0]:
+                best = (opened, i + 1)
+        elif char == '"' and open_positions:
+            in_string = True
+
+    return text[best[0]:best[1]] if best else None
+
 
 class ContentExtractor:
     """
@@ -21,17 +98,18 @@ class ContentExtractor:
         Returns:
             Cleaned answer text
         """
+        # Extract code blocks if present; only the first one is used, so the
+        # scan stops there and none of the cleanup below is needed
+        code_block = _CODE_RE.search(text)
+        if code_block:
+            return code_block.group(1).strip()
+
         # Remove starting phrases like "The answer is" or "Here's the answer:"
-        cleaned_text = re.sub(r'^(the answer is|here\'s the answer|answer:|result:|solution:)',
-                              '', text, flags=re.IGNORECASE)
+        cleaned_text = _ANS_PREFIX_RE.sub('', text, count=1).strip()
 
         # Remove quotes if the entire text is quoted
-        cleaned_text = re.sub(r'^"(.*)"$', r'\1', cleaned_text.strip())
-
-        # Extract code blocks if present
-        code_blocks = re.findall(r'```(?:\w+)?\s*([\s\S]+?)\s*```', text)
-        if code_blocks:
-            return code_blocks[0].strip()
+        if cleaned_text.startswith('"'):
+            cleaned_text = _QUOTE_RE.sub(r'\1', cleaned_text)
 
         # Remove explanations and justifications
         cleaned_text = self._remove_explanations(cleaned_text)
@@ -52,29 +130,23 @@ class ContentExtractor:
         lines = text.split('\n')
         cleaned_lines = []
 
-        # Skip lines that look like explanations
-        explanation_patterns = [
-            r'^\s*explanation\s*:',
-            r'^\s*I think',
-            r'^\s*Based on',
-            r'^\s*According to',
-            r'^\s*This is because',
-            r'^\s*Let me explain',
-            r'^\s*To solve this'
-        ]
-
         in_explanation = False
 
         for line in lines:
+            stripped = line.lstrip()
+
             # Check if line starts an explanation section
-            if any(re.search(pattern, line, re.IGNORECASE) for pattern in explanation_patterns):
+            lowered = stripped.lower()
+            if lowered.startswith(_EXPLANATION_PREFIXES) or (
+                lowered.startswith('explanation') and lowered[11:].lstrip().startswith(':')
+            ):
                 in_explanation = True
                 continue
 
             # Skip if in explanation section
             if in_explanation:
                 # Check if line might be ending the explanation
-                if line.strip() == '' or line.strip().startswith('#') or line.strip().startswith('```'):
+                if not stripped or stripped.startswith(('#', '```')):
                     in_explanation = False
                 else:
                     continue
@@ -94,17 +166,7 @@ class ContentExtractor:
         Returns:
             List of extracted dates
         """
-        date_patterns = [
-            r'\d{4}-\d{2}-\d{2}',  # YYYY-MM-DD
-            r'\d{1,2}/\d{1,2}/\d{4}',  # MM/DD/YYYY
-            r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{1,2},? \d{4}'  # Month DD, YYYY
-        ]
-
-        dates = []
-        for pattern in date_patterns:
-            dates.extend(re.findall(pattern, text))
-
-        return dates
+        return [date for pattern in _DATE_RES for date in pattern.findall(text)]
 
     def extract_json(self, text: str) -> Optional[str]:
         """
@@ -116,15 +178,15 @@ class ContentExtractor:
         Returns:
             Extracted JSON string or None if not found
         """
-        # Try to find JSON between markers
-        json_patterns = [
-            r'```(?:json)?\s*(\{[\s\S]*?\})\s*```',  # JSON in code block
-            r'(\{[\s\S]*?\})'  # Bare JSON object
-        ]
-
-        for pattern in json_patterns:
-            matches = re.findall(pattern, text)
-            if matches:
-                return matches[0]
-
-        return None
\ No newline at end of file
+        # Without an opening brace there is no object to find
+        if '{' not in text:
+            return None
+
+        # Try to find JSON between markers, if there are any
+        if '```' in text:
+            match = _JSON_BLOCK_RE.search(text)
+            if match:
+                return match.group(1)
+
+        # Otherwise take the first bare object, matching nested braces
+        return _find_json_object(text)
\ No newline at end of file
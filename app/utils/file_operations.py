@@ -4,10 +4,18 @@ File handling utilities for the Assignment Helper API.
 
 import os
 import uuid
-import shutil
+import logging
 from fastapi import UploadFile
 from typing import Optional
 
+from app.utils.file_utils import write_upload_file
+
+logger = logging.getLogger(__name__)
+
+# Directory for stored uploads, created once at import
+_UPLOAD_DIR = "uploads"
+os.makedirs(_UPLOAD_DIR, exist_ok=True)
+
 
 async def store_uploaded_file(upload_file: UploadFile) -> str:
     """
@@ -19,22 +27,14 @@ async def store_uploaded_file(upload_file: UploadFile) -> str:
     Returns:
         Path to the stored file
     """
-    # Create a unique filename using UUID to avoid collisions
-    unique_id = str(uuid.uuid4())
-    original_filename = upload_file.filename or "unknown"
-
     # Extract file extension
-    _, file_extension = os.path.splitext(original_filename)
+    file_extension = os.path.splitext(upload_file.filename or "")[1]
 
-    # Create directory for uploads if it doesn't exist
-    os.makedirs("uploads", exist_ok=True)
-
-    # Create full path with unique filename
-    temp_file_path = os.path.join("uploads", f"{unique_id}{file_extension}")
+    # Create full path with a unique filename using UUID to avoid collisions
+    temp_file_path = f"{_UPLOAD_DIR}/{uuid.uuid4().hex}{file_extension}"
 
     # Save the file
-    with open(temp_file_path, "wb") as buffer:
-        shutil.copyfileobj(upload_file.file, buffer)
+    await write_upload_file(upload_file, temp_file_path)
 
     return temp_file_path
 
@@ -47,16 +47,12 @@ async def remove_temp_file(file_path: str) -> None:
         file_path: Path to the file to be removed
     """
     try:
+        # The uploads directory itself is kept, since it is only created at import
         if os.path.exists(file_path):
             os.remove(file_path)
 
-            # If file was in uploads directory and directory is empty, clean it up
-            directory = os.path.dirname(file_path)
-            if directory == "uploads" and not os.listdir(directory):
-                os.rmdir(directory)
-
     except Exception as e:
-        print(f"Error removing temporary file {file_path}: {str(e)}")
+        logger.warning("Error removing temporary file %s: %s", file_path, e)
 
 
 async def get_file_info(file_path: str) -> dict:
@@ -69,13 +65,18 @@ async def get_file_info(file_path: str) -> dict:
     Returns:
         Dictionary with file information
     """
-    if not os.path.exists(file_path):
+    try:
+        # One stat call answers both existence and size
+        file_stat = os.stat(file_path)
+    except FileNotFoundError:
         return {"error": "File not found"}
+    except Exception as e:
+        return {"error": str(e)}
 
     try:
         return {
             "filename": os.path.basename(file_path),
-            "size": os.path.getsize(file_path),
+            "size": file_stat.st_size,
             "extension": os.path.splitext(file_path)[1].lower(),
             "path": file_path
         }
@@ -2,12 +2,42 @@
 File handling utilities.
 """
 
+import io
 import os
+import codecs
+import logging
+import asyncio
 import shutil
 import tempfile
 import zipfile
+import aiofiles
 from fastapi import UploadFile
-from typing import Optional, List
+from typing import Iterator, Optional, List
+
+from app.utils.cache_utils import content_hasher
+
+logger = logging.getLogger(__name__)
+
+# Chunk size used when streaming uploads and archive members to disk
+_COPY_CHUNK_SIZE = 1 << 20
+
+# Extensions whose file type is decided without reading the file
+_ARCHIVE_EXTS = frozenset({'.zip', '.gz', '.tar', '.tgz', '.bz2', '.xz', '.7z'})
+_CSV_EXTS = frozenset({'.csv'})
+_JSON_EXTS = frozenset({'.json'})
+_TEXT_EXTS = frozenset({'.txt', '.md'})
+
+# Flattened to one lookup so an extension is classified with a single hash probe
+_EXTENSION_FILE_TYPES = {
+    ext: file_type
+    for exts, file_type in (
+        (_ARCHIVE_EXTS, "archive"),
+        (_CSV_EXTS, "csv"),
+        (_JSON_EXTS, "json"),
+        (_TEXT_EXTS, "text"),
+    )
+    for ext in exts
+}
 
 
 async def save_upload_file(upload_file: UploadFile) -> str:
@@ -24,13 +54,59 @@ async def save_upload_file(upload_file: UploadFile) -> str:
     temp_file = f"temp_{upload_file.filename}"
 
     # Save the file
-    with open(temp_file, "wb") as buffer:
-        shutil.copyfileobj(upload_file.file, buffer)
+    await write_upload_file(upload_file, temp_file)
 
     # Return the path to the saved file
     return temp_file
 
 
+async def write_upload_file(upload_file: UploadFile, destination: str) -> None:
+    """
+    Write an uploaded file to disk without blocking the event loop.
+
+    Uploads that Starlette has spooled to a temporary file are copied
+    kernel-side; smaller in-memory uploads are streamed in chunks.
+
+    Args:
+        upload_file: FastAPI UploadFile object
+        destination: Path to write the file to
+    """
+    source = upload_file.file
+
+    # Same check Starlette uses: SpooledTemporaryFile sets _rolled once on disk
+    if getattr(source, "_rolled", True) and hasattr(os, "copy_file_range"):
+        try:
+            source.fileno()
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            pass
+        else:
+            await asyncio.to_thread(_copy_file_kernel_side, source, destination)
+            return
+
+    async with aiofiles.open(destination, "wb") as buffer:
+        while chunk := await upload_file.read(_COPY_CHUNK_SIZE):
+            await buffer.write(chunk)
+
+
+def _copy_file_kernel_side(source: io.BufferedIOBase, destination: str) -> None:
+    """
+    Copy the rest of an open file to a path with copy_file_range, falling back
+    to a buffered copy where the kernel or filesystem does not support it.
+
+    Args:
+        source: Open binary file, read from its current position
+        destination: Path to write the file to
+    """
+    with open(destination, "wb") as buffer:
+        offset = source.tell()
+        try:
+            while copied := os.copy_file_range(source.fileno(), buffer.fileno(), 1 << 30, offset):
+                offset += copied
+        except OSError:
+            source.seek(offset)
+            shutil.copyfileobj(source, buffer, _COPY_CHUNK_SIZE)
+
+
 def cleanup_temp_file(file_path: str) -> None:
     """
     Delete a temporary file if it exists.
@@ -42,7 +118,7 @@ def cleanup_temp_file(file_path: str) -> None:
         try:
             os.remove(file_path)
         except Exception as e:
-            print(f"Error deleting temporary file {file_path}: {str(e)}")
+            logger.warning("Error deleting temporary file %s: %s", file_path, e)
 
 
 async def get_file_type(file_path: str) -> str:
@@ -55,33 +131,24 @@ async def get_file_type(file_path: str) -> str:
     Returns:
         File type as a string (e.g., "zip", "csv", "text")
     """
-    # Check extension first
-    ext = os.path.splitext(file_path)[1].lower()
-
-    # Handle common file types
-    if ext in ['.zip', '.gz', '.tar']:
-        return "archive"
-    elif ext in ['.csv']:
-        return "csv"
-    elif ext in ['.json']:
-        return "json"
-    elif ext in ['.txt', '.md']:
-        return "text"
+    # Check extension first; common file types never touch the file
+    file_type = _EXTENSION_FILE_TYPES.get(os.path.splitext(file_path)[1].lower())
+    if file_type:
+        return file_type
 
-    # Check content for ambiguous cases
+    # Check content for ambiguous cases with a single read
     try:
         with open(file_path, 'rb') as f:
-            header = f.read(4)
+            header = f.read(1024)
 
-            # Check for ZIP header
-            if header.startswith(b'PK\x03\x04'):
-                return "archive"
+        # Check for ZIP header
+        if header.startswith(b'PK\x03\x04'):
+            return "archive"
 
-            # Check for CSV-like content (text with commas)
-            f.seek(0)
-            content = f.read(1024).decode('utf-8', errors='ignore')
-            if ',' in content and '\n' in content:
-                return "csv"
+        # Check for CSV-like content (text with commas); both are ASCII, so
+        # the raw bytes can be searched without decoding
+        if b',' in header and b'\n' in header:
+            return "csv"
 
     except Exception:
         pass
@@ -105,13 +172,117 @@ async def extract_from_zip(zip_path: str, extract_path: Optional[str] = None) ->
     if extract_path is None:
         extract_path = tempfile.mkdtemp()
 
-    # Extract the ZIP file
+    root = os.path.realpath(extract_path)
     with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-        zip_ref.extractall(extract_path)
+        # Resolve every member path before extracting anything, so an unsafe
+        # name is rejected without starting any worker
+        members = [(info, _member_target(root, info)) for info in zip_ref.infolist()]
+
+        # Extract the members in worker threads; zlib releases the GIL, so
+        # compressed members decompress in parallel. Every worker finishes
+        # before the archive is closed, even if one of them fails.
+        results = await asyncio.gather(*(
+            asyncio.to_thread(_extract_member, zip_ref, info, target)
+            for info, target in members
+        ), return_exceptions=True)
+
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
 
     return extract_path
 
 
+def _member_target(root: str, info: zipfile.ZipInfo) -> str:
+    """
+    Resolve where a ZIP member is extracted to.
+
+    Args:
+        root: Resolved extraction directory
+        info: Archive member
+
+    Returns:
+        Absolute path of the member below the extraction directory
+
+    Raises:
+        ValueError: If the member path would land outside the extraction directory
+    """
+    target = os.path.realpath(os.path.join(root, info.filename))
+    if os.path.commonpath((root, target)) != root:
+        raise ValueError(f"Unsafe path in ZIP archive: {info.filename}")
+    return target
+
+
+def _extract_member(zip_ref: zipfile.ZipFile, info: zipfile.ZipInfo, target: str) -> None:
+    """
+    Extract a single ZIP member to a path, streaming it in large blocks.
+
+    Args:
+        zip_ref: Open ZIP archive
+        info: Member to extract
+        target: Destination path from _member_target
+    """
+    if info.is_dir():
+        os.makedirs(target, exist_ok=True)
+        return
+
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with zip_ref.open(info) as source, open(target, 'wb') as destination:
+        shutil.copyfileobj(source, destination, _COPY_CHUNK_SIZE)
+
+
+async def file_fingerprint(file_path: str) -> bytes:
+    """
+    Compute a fast content digest of a file, suitable as a cache key.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        Content digest of the file (see cache_utils.content_hasher)
+    """
+    def digest() -> bytes:
+        file_hash = content_hasher()
+        with open(file_path, 'rb') as f:
+            while chunk := f.read(1 << 20):
+                file_hash.update(chunk)
+        return file_hash.digest()
+
+    return await asyncio.to_thread(digest)
+
+
+def _iter_files(directory: str) -> Iterator[os.DirEntry]:
+    """
+    Recursively yield the files in a directory in the same order as os.walk,
+    using the file type information cached on each DirEntry.
+
+    Args:
+        directory: Path to search in
+
+    Yields:
+        Directory entries for files (not directories)
+    """
+    subdirs = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if not is_dir:
+                    yield entry
+                elif not entry.is_symlink():
+                    # Like os.walk, do not descend into symlinked directories
+                    subdirs.append(entry.path)
+    except OSError:
+        # Unreadable directories are skipped, as os.walk does
+        return
+
+    for subdir in subdirs:
+        yield from _iter_files(subdir)
+
+
 async def find_file_by_extension(directory: str, extension: str) -> Optional[str]:
     """
     Find the first file with a specific extension in a directory (recursive).
@@ -123,12 +294,8 @@ async def find_file_by_extension(directory: str, extension: str) -> Optional[str
     Returns:
         Path to the found file or None if not found
     """
-    for root, _, files in os.walk(directory):
-        for file in files:
-            if file.lower().endswith(extension.lower()):
-                return os.path.join(root, file)
-
-    return None
+    extension = extension.lower()
+    return next((entry.path for entry in _iter_files(directory) if entry.name.lower().endswith(extension)), None)
 
 
 async def read_file_content(file_path: str, max_size: int = 1024 * 1024) -> Optional[str]:
@@ -143,34 +310,33 @@ async def read_file_content(file_path: str, max_size: int = 1024 * 1024) -> Opti
         File content as string or None if file is not readable as text
     """
     try:
-        # Check file size first
-        file_size = os.path.getsize(file_path)
-        size_to_read = min(file_size, max_size)
-
-        # Try different encodings
-        for encoding in ['utf-8', 'latin1', 'cp1252']:
-            try:
-                with open(file_path, 'r', encoding=encoding) as f:
-                    content = f.read(size_to_read)
-                    if file_size > max_size:
-                        content += "\n...[content truncated]..."
-                    return content
-            except UnicodeDecodeError:
-                continue
-
-        # If all encodings fail, read as binary and try to decode
+        # Read the bounded prefix once; every decode attempt reuses the bytes
         with open(file_path, 'rb') as f:
-            binary_content = f.read(size_to_read)
-            try:
-                content = binary_content.decode('utf-8', errors='replace')
-                if file_size > max_size:
-                    content += "\n...[content truncated]..."
-                return content
-            except:
-                return None  # Not a text file
+            file_size = os.fstat(f.fileno()).st_size
+            data = f.read(max_size)
+        truncated = file_size > max_size
+
+        if data.startswith(codecs.BOM_UTF8):
+            data = data[len(codecs.BOM_UTF8):]
+
+        try:
+            # A multi-byte character cut off by the size limit is dropped
+            # rather than failing the whole UTF-8 decode
+            content = codecs.getincrementaldecoder('utf-8')().decode(data, final=not truncated)
+        except UnicodeDecodeError:
+            # latin1 maps every byte, so this cannot fail
+            content = data.decode('latin1')
+
+        # Match text-mode reads, which translate line endings
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+
+        if truncated:
+            content += "\n...[content truncated]..."
+        return content
 
     except Exception as e:
-        print(f"Error reading file {file_path}: {str(e)}")
+        logger.warning("Error reading file %s: %s", file_path, e)
         return None
 
 
@@ -184,10 +350,4 @@ async def list_files_in_directory(directory: str) -> List[str]:
     Returns:
         List of file paths
     """
-    file_list = []
-
-    for root, _, files in os.walk(directory):
-        for file in files:
-            file_list.append(os.path.join(root, file))
-
-    return file_list
\ No newline at end of file
+    return [entry.path for entry in _iter_files(directory)]
\ No newline at end of file
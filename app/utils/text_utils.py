@@ -3,7 +3,31 @@ Text processing utilities.
 """
 
 import re
-from typing import Optional, List, Any
+import functools
+from typing import Optional, List, Any, Pattern
+
+# Runs of whitespace collapsed by normalize_text
+_WS_RE = re.compile(r'\s+')
+
+# Patterns like "key: value" or "key = value"
+_KV_RE = re.compile(r'(\w+)\s*[:=]\s*([^,\n]+)')
+
+# Date ranges in the supported formats; possessive quantifiers avoid
+# backtracking where the following token can never match what they consumed
+_DATE_RANGE_RES = tuple(re.compile(p) for p in (
+    # YYYY-MM-DD
+    r'(\d{4}-\d{2}-\d{2})\s++to\s++(\d{4}-\d{2}-\d{2})',
+    # MM/DD/YYYY
+    r'(\d{1,2}+/\d{1,2}+/\d{4})\s++to\s++(\d{1,2}+/\d{1,2}+/\d{4})',
+    # Month DD, YYYY
+    r'([A-Z][a-z]++ \d{1,2}+, \d{4})\s++to\s++([A-Z][a-z]++ \d{1,2}+, \d{4})'
+))
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile(pattern: str, flags: int = 0) -> Pattern:
+    """Compile a caller-supplied pattern once per (pattern, flags) pair."""
+    return re.compile(pattern, flags)
 
 
 def extract_pattern(text: str, pattern: str, flags: int = 0) -> Optional[str]:
@@ -18,7 +42,7 @@ def extract_pattern(text: str, pattern: str, flags: int = 0) -> Optional[str]:
     Returns:
         Matched string or None if not found
     """
-    match = re.search(pattern, text, flags)
+    match = _compile(pattern, flags).search(text)
     if match:
         return match.group(1) if match.groups() else match.group(0)
     return None
@@ -36,7 +60,7 @@ def extract_all_patterns(text: str, pattern: str, flags: int = 0) -> List[str]:
     Returns:
         List of matched strings
     """
-    matches = re.findall(pattern, text, flags)
+    matches = _compile(pattern, flags).findall(text)
     if isinstance(matches[0], tuple) if matches else False:
         # If matches are tuples (groups), flatten them
         return [group for match in matches for group in match if group]
@@ -54,7 +78,7 @@ def normalize_text(text: str) -> str:
         Normalized text
     """
     # Replace multiple whitespace with a single space
-    text = re.sub(r'\s+', ' ', text)
+    text = _WS_RE.sub(' ', text)
     # Strip leading/trailing whitespace
     return text.strip()
 
@@ -69,16 +93,9 @@ def extract_key_value_pairs(text: str) -> dict:
     Returns:
         Dictionary of key-value pairs
     """
-    pairs = {}
-    
-    # Look for patterns like "key: value" or "key = value"
-    pattern = r'(\w+)\s*[:=]\s*([^,\n]+)'
-    matches = re.findall(pattern, text)
-    
-    for key, value in matches:
-        pairs[key.strip()] = value.strip()
-    
-    return pairs
+    # Look for patterns like "key: value" or "key = value"; keys are \w+ and
+    # need no stripping
+    return {match.group(1): match.group(2).strip() for match in _KV_RE.finditer(text)}
 
 
 def extract_date_range(text: str) -> Optional[tuple]:
@@ -92,17 +109,8 @@ def extract_date_range(text: str) -> Optional[tuple]:
         Tuple of (start_date, end_date) or None if not found
     """
     # Try different date formats
-    patterns = [
-        # YYYY-MM-DD
-        r'(\d{4}-\d{2}-\d{2})\s+to\s+(\d{4}-\d{2}-\d{2})',
-        # MM/DD/YYYY
-        r'(\d{1,2}/\d{1,2}/\d{4})\s+to\s+(\d{1,2}/\d{1,2}/\d{4})',
-        # Month DD, YYYY
-        r'([A-Z][a-z]+ \d{1,2}, \d{4})\s+to\s+([A-Z][a-z]+ \d{1,2}, \d{4})'
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, text)
+    for pattern in _DATE_RANGE_RES:
+        match = pattern.search(text)
         if match:
             return match.groups()
     
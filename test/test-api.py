@@ -3,20 +3,34 @@ Simple test script to validate the TDS Assignment Solver API.
 Run this script to test if the API is working correctly.
 """
 
+import io
 import requests
 import json
 import os
 import tempfile
 import zipfile
 import pandas as pd
-from pathlib import Path
 import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # Default API URL (update this when deployed)
 DEFAULT_API_URL = "http://localhost:8000/api/"
 
+# One session per thread so requests reuse kept-alive connections; sessions
+# are not guaranteed to be thread-safe
+_local = threading.local()
 
-def test_api_with_question(api_url, question, file_path=None):
+
+def get_session():
+    """Return this thread's requests session, creating it on first use."""
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = _local.session = requests.Session()
+    return session
+
+
+def test_api_with_question(api_url, question, file_path=None, log=print):
     """
     Test the API with a specific question and optional file.
 
@@ -24,11 +38,12 @@ def test_api_with_question(api_url, question, file_path=None):
         api_url: The API endpoint URL
         question: The question to test with
         file_path: Optional path to a file to upload
+        log: Function called with each line of output
     """
-    print(f"\n🧪 Testing with question: {question}")
+    log(f"\n🧪 Testing with question: {question}")
 
     if file_path:
-        print(f"📁 Using file: {file_path}")
+        log(f"📁 Using file: {file_path}")
 
     # Prepare the request
     data = {"question": question}
@@ -41,7 +56,7 @@ def test_api_with_question(api_url, question, file_path=None):
 
     try:
         # Send the request
-        response = requests.post(
+        response = get_session().post(
             api_url,
             data=data,
             files=files
@@ -50,11 +65,11 @@ def test_api_with_question(api_url, question, file_path=None):
         # Print the result
         if response.status_code == 200:
             result = response.json()
-            print(f"✅ Success! Answer: {result['answer']}")
+            log(f"✅ Success! Answer: {result['answer']}")
             return result['answer']
         else:
-            print(f"❌ Error: {response.status_code}")
-            print(response.text)
+            log(f"❌ Error: {response.status_code}")
+            log(response.text)
             return None
 
     finally:
@@ -65,21 +80,29 @@ def test_api_with_question(api_url, question, file_path=None):
 
 def create_test_csv_file():
     """Create a test CSV file for testing CSV extraction questions."""
-    # Create a temporary CSV file
-    with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as temp_csv:
-        temp_csv.write(b"id,answer,value\n1,test_answer,42\n")
-        temp_csv_path = temp_csv.name
+    # Build the ZIP containing the CSV in memory
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        zipf.writestr("extract.csv", b"id,answer,value\n1,test_answer,42\n")
 
-    # Create a temporary ZIP file containing the CSV
-    zip_path = Path(temp_csv_path).with_suffix('.zip')
+    # Write it to a temporary ZIP file in one go
+    with tempfile.NamedTemporaryFile(suffix=".zip", delete=False) as temp_zip:
+        temp_zip.write(buffer.getvalue())
+        zip_path = temp_zip.name
 
-    with zipfile.ZipFile(zip_path, 'w') as zipf:
-        zipf.write(temp_csv_path, arcname="extract.csv")
+    return zip_path
 
-    # Clean up CSV file
-    os.remove(temp_csv_path)
 
-    return zip_path
+def run_buffered_test(api_url, question, file_path=None):
+    """
+    Run test_api_with_question, collecting its output instead of printing it.
+
+    Returns:
+        Tuple of (answer or None, list of output lines)
+    """
+    lines = []
+    answer = test_api_with_question(api_url, question, file_path, log=lines.append)
+    return answer, lines
 
 
 def run_standard_tests(api_url):
@@ -89,54 +112,58 @@ def run_standard_tests(api_url):
 
     # Test 1: Wednesday counting question
     wednesday_question = "How many Wednesdays are there in the date range 1985-09-10 to 2011-10-02?"
-    wednesday_result = test_api_with_question(api_url, wednesday_question)
 
     # Test 2: JSON sorting question
     json_question = 'Sort this JSON array by age: [{"name":"Alice","age":55},{"name":"Bob","age":30},{"name":"Charlie","age":55}]'
-    json_result = test_api_with_question(api_url, json_question)
 
     # Test 3: CSV extraction question
     csv_question = "Download and unzip file which has a single extract.csv file inside. What is the value in the \"answer\" column of the CSV file?"
 
-    try:
-        # Create test file
-        zip_path = create_test_csv_file()
-
-        # Test with file
-        csv_result = test_api_with_question(api_url, csv_question, zip_path)
-
-    finally:
-        # Clean up
-        if 'zip_path' in locals() and os.path.exists(zip_path):
-            os.remove(zip_path)
-
     # Test 4: Prettier hash question
     prettier_question = "Download README.md. In the directory where you downloaded it, make sure it is called README.md, and run npx -y prettier@3.4.2 README.md | sha256sum. What is the output of the command?"
 
+    # Test 5: Google Sheets formula question
+    sheets_question = "In Google Sheets, what is the result of this formula: =SUM(ARRAY_CONSTRAIN(SEQUENCE(100, 100, 0, 8), 1, 10))?"
+
+    # Create the test files up front so all tests can run at once
+    zip_path = create_test_csv_file()
+
     # Create a simple README.md file for testing
     with tempfile.NamedTemporaryFile(suffix=".md", delete=False) as temp_file:
         temp_file.write(b"# Test Heading\n\nThis is a test README file.\n* Bullet point\n* Another bullet point\n")
         readme_path = temp_file.name
 
+    tests = [
+        ("Wednesday counting", wednesday_question, None),
+        ("JSON sorting", json_question, None),
+        ("CSV extraction", csv_question, zip_path),
+        ("Prettier hash", prettier_question, readme_path),
+        ("Google Sheets formula", sheets_question, None),
+    ]
+
     try:
-        # Test with file
-        prettier_result = test_api_with_question(api_url, prettier_question, readme_path)
+        # The tests are independent, so run them concurrently; each test's
+        # output is printed as a block so answers stay next to their question
+        results = {}
+        with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+            futures = {
+                name: executor.submit(run_buffered_test, api_url, question, file_path)
+                for name, question, file_path in tests
+            }
+            for name, future in futures.items():
+                results[name], lines = future.result()
+                print("\n".join(lines))
+
     finally:
         # Clean up
-        if os.path.exists(readme_path):
-            os.remove(readme_path)
-
-    # Test 5: Google Sheets formula question
-    sheets_question = "In Google Sheets, what is the result of this formula: =SUM(ARRAY_CONSTRAIN(SEQUENCE(100, 100, 0, 8), 1, 10))?"
-    sheets_result = test_api_with_question(api_url, sheets_question)
+        for path in (zip_path, readme_path):
+            if os.path.exists(path):
+                os.remove(path)
 
     # Summary
     print("\n📊 Test Summary:")
-    print(f"Wednesday counting: {'✅ Pass' if wednesday_result else '❌ Fail'}")
-    print(f"JSON sorting: {'✅ Pass' if json_result else '❌ Fail'}")
-    print(f"CSV extraction: {'✅ Pass' if csv_result else '❌ Fail'}")
-    print(f"Prettier hash: {'✅ Pass' if prettier_result else '❌ Fail'}")
-    print(f"Google Sheets formula: {'✅ Pass' if sheets_result else '❌ Fail'}")
+    for name, result in results.items():
+        print(f"{name}: {'✅ Pass' if result else '❌ Fail'}")
 
 
 def main():
@@ -0,0 +1,79 @@
+"""
+Unit tests for the JSON handlers' compatibility with the stdlib json module.
+Run from the repository root with:
+    PYTHONPATH=. python -m unittest discover -s test -p "test_*.py"
+"""
+
+import asyncio
+import hashlib
+import os
+import tempfile
+import unittest
+
+from app.handlers.json_handler import JSONHandler
+from app.handlers.json_processor_handler import JSONProcessorHandler
+
+
+class SortJSONTest(unittest.TestCase):
+    """sort_json must serialize exactly like json.dumps(separators=(',', ':'))."""
+
+    def sort(self, json_str):
+        return asyncio.run(JSONHandler().sort_json(json_str))
+
+    def test_big_integer_kept_exact(self):
+        self.assertEqual(self.sort('[123456789012345678901234]'), '[123456789012345678901234]')
+
+    def test_exponent_float_and_non_ascii(self):
+        self.assertEqual(
+            self.sort('[{"name":"José","age":1e20},{"name":"Bo","age":3}]'),
+            '[{"name":"Bo","age":3},{"name":"Jos\\u00e9","age":1e+20}]'
+        )
+
+    def test_nan_accepted(self):
+        self.assertEqual(self.sort('[NaN]'), '[NaN]')
+
+
+class JSONProcessorTest(unittest.TestCase):
+    """Hashes and conversions must use json.dumps' exact serialization."""
+
+    def run_handler(self, method, *args):
+        async def call():
+            handler = JSONProcessorHandler()
+            try:
+                return await getattr(handler, method)(*args)
+            finally:
+                await handler.aclose()
+        return asyncio.run(call())
+
+    def expected_hash(self, normalized):
+        return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+    def test_hash_big_integer(self):
+        self.assertEqual(
+            self.run_handler("get_json_hash", '{"id":123456789012345678901234}'),
+            self.expected_hash('{"id":123456789012345678901234}')
+        )
+
+    def test_hash_exponent_float(self):
+        self.assertEqual(
+            self.run_handler("get_json_hash", '{"b":1e16,"a":0.5}'),
+            self.expected_hash('{"a":0.5,"b":1e+16}')
+        )
+
+    def test_hash_nan_computed_locally(self):
+        self.assertEqual(self.run_handler("get_json_hash", '{"a":NaN}'), self.expected_hash('{"a":NaN}'))
+
+    def test_convert_keyvalue_big_integer(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+            f.write("id=12345678901234567890123\nx=1e16\n")
+        try:
+            self.assertEqual(
+                self.run_handler("convert_keyvalue_to_json", f.name),
+                '{"id":12345678901234567890123,"x":1e+16}'
+            )
+        finally:
+            os.remove(f.name)
+
+
+if __name__ == "__main__":
+    unittest.main()